@@ -5,6 +5,7 @@ Core module for Nuke utilities
 from .constants import *
 from .env import *
 from .logging_utils import *
+from .undo import *
 
 # Initialize environment on import
 env = get_env()
\ No newline at end of file
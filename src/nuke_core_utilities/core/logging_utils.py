@@ -415,26 +415,31 @@ class NukeLogger:
         """
         self.logger.exception(msg, exc_info=exc_info, extra=kwargs)
     
-    # Convenience methods that mirror standard logging interface
-    def critical(self, msg: str, **kwargs):
+    # Convenience methods that mirror standard logging interface.
+    # Positional args are %-style format arguments, only applied if emitted.
+    def critical(self, msg: str, *args, **kwargs):
         """Log CRITICAL level message"""
-        self.logger.critical(msg, extra=kwargs)
+        self.logger.critical(msg, *args, extra=kwargs)
     
-    def error(self, msg: str, **kwargs):
+    def error(self, msg: str, *args, **kwargs):
         """Log ERROR level message"""
-        self.logger.error(msg, extra=kwargs)
+        self.logger.error(msg, *args, extra=kwargs)
     
-    def warning(self, msg: str, **kwargs):
+    def warning(self, msg: str, *args, **kwargs):
         """Log WARNING level message"""
-        self.logger.warning(msg, extra=kwargs)
+        self.logger.warning(msg, *args, extra=kwargs)
     
-    def info(self, msg: str, **kwargs):
+    def info(self, msg: str, *args, **kwargs):
         """Log INFO level message"""
-        self.logger.info(msg, extra=kwargs)
+        self.logger.info(msg, *args, extra=kwargs)
     
-    def debug(self, msg: str, **kwargs):
+    def debug(self, msg: str, *args, **kwargs):
         """Log DEBUG level message"""
-        self.logger.debug(msg, extra=kwargs)
+        self.logger.debug(msg, *args, extra=kwargs)
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """Check if a message of the given level would be processed"""
+        return self.logger.isEnabledFor(level)
     
     def set_level(self, level: str):
         """
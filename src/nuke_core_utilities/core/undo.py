@@ -0,0 +1,31 @@
+"""
+Undo grouping for bulk node graph edits
+"""
+
+from contextlib import contextmanager
+import nuke
+
+
+@contextmanager
+def undo_group(name: str):
+    """
+    Record the edits made inside the block as a single undo step
+
+    Works as a context manager or as a decorator:
+
+        with undo_group("align_nodes"):
+            ...
+
+        @undo_group("create_node_grid")
+        def create_node_grid(...):
+            ...
+
+    Args:
+        name: Label of the undo step
+    """
+    undo = nuke.Undo()
+    undo.begin(name)
+    try:
+        yield
+    finally:
+        undo.end()
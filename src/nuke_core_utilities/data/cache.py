@@ -17,6 +17,15 @@ from ..core.env import get_env
 
 logger = get_logger(__name__)
 
+# Keys written by NukeCache.cache_node_data look like "node:<name>:<hash>"
+_NODE_KEY_PREFIX = "node:"
+
+def _node_name_of(key: str) -> Optional[str]:
+    """Node name encoded in a node data key, or None for other keys"""
+    if key.startswith(_NODE_KEY_PREFIX):
+        return key.split(':', 2)[1]
+    return None
+
 class CacheEntry:
     """Single cache entry"""
     
@@ -71,13 +80,15 @@ class NukeCache:
         
         with self._lock:
             self.cache: Dict[str, CacheEntry] = {}
+            # node name -> keys of its node data entries in self.cache
+            self._node_keys: Dict[str, set] = {}
             self.max_size = 1000  # Maximum entries
             self.default_ttl = 3600  # 1 hour default TTL
             self.hits = 0
             self.misses = 0
             
             # Get cache directory from environment
-            env = "get_env"()
+            env = get_env()
             cache_dir = env.get_path('project_temp', Path.home() / '.nuke_cache')
             self.cache_dir = Path(cache_dir) / 'data_cache'
             self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -114,6 +125,9 @@ class NukeCache:
                         k: CacheEntry(**v) 
                         for k, v in data.get('cache', {}).items()
                     }
+                    self._node_keys = {}
+                    for key in self.cache:
+                        self._index_key(key)
                     self.hits = data.get('hits', 0)
                     self.misses = data.get('misses', 0)
                 logger.debug(f"Loaded {len(self.cache)} cache entries from disk")
@@ -142,6 +156,23 @@ class NukeCache:
         except Exception as e:
             logger.error(f"Failed to save cache to disk: {e}")
     
+    def _index_key(self, key: str):
+        """Record a node data key in the per-node index"""
+        name = _node_name_of(key)
+        if name is not None:
+            self._node_keys.setdefault(name, set()).add(key)
+    
+    def _remove_entry(self, key: str):
+        """Remove an entry and its per-node index record"""
+        del self.cache[key]
+        name = _node_name_of(key)
+        if name is not None:
+            keys = self._node_keys.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._node_keys[name]
+    
     def generate_key(self, *args, **kwargs) -> str:
         """Generate cache key from arguments"""
         # Create string representation
@@ -167,7 +198,7 @@ class NukeCache:
                 
                 if entry.is_expired():
                     # Remove expired entry
-                    del self.cache[key]
+                    self._remove_entry(key)
                     self.misses += 1
                     return default
                 
@@ -187,19 +218,20 @@ class NukeCache:
                     self.cache.keys(),
                     key=lambda k: self.cache[k].last_accessed
                 )
-                del self.cache[oldest_key]
+                self._remove_entry(oldest_key)
             
             if ttl is None:
                 ttl = self.default_ttl
             
             entry = CacheEntry(key, value, ttl)
             self.cache[key] = entry
+            self._index_key(key)
     
     def delete(self, key: str) -> bool:
         """Delete entry from cache"""
         with self._lock:
             if key in self.cache:
-                del self.cache[key]
+                self._remove_entry(key)
                 return True
             return False
     
@@ -207,6 +239,7 @@ class NukeCache:
         """Clear all cache entries"""
         with self._lock:
             self.cache.clear()
+            self._node_keys.clear()
             self.hits = 0
             self.misses = 0
             logger.info("Cache cleared")
@@ -220,7 +253,7 @@ class NukeCache:
             ]
             
             for key in expired_keys:
-                del self.cache[key]
+                self._remove_entry(key)
             
             if expired_keys:
                 logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
@@ -255,15 +288,30 @@ class NukeCache:
         
         # Try to find any cached data for this node
         with self._lock:
-            for key in list(self.cache.keys()):
-                if key.startswith(f"node:{node.name()}:"):
-                    entry = self.cache[key]
-                    if not entry.is_expired():
-                        entry.access()
-                        return entry.value
+            for key in self._node_keys.get(node.name(), ()):
+                entry = self.cache[key]
+                if not entry.is_expired():
+                    entry.access()
+                    return entry.value
         
         return default
     
+    def delete_node_data(self, node_name: str) -> int:
+        """
+        Delete all cached data for a node
+        
+        Args:
+            node_name: Node name
+            
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = self._node_keys.pop(node_name, ())
+            for key in keys:
+                del self.cache[key]
+            return len(keys)
+    
     def cache_script_state(self, script_path: str = None):
         """Cache current script state"""
         if script_path is None:
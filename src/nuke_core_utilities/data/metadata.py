@@ -3,18 +3,87 @@ Metadata management for Nuke nodes and scripts
 """
 
 import json
+import os
+import platform
 import re
 import uuid
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Set
+from typing import Dict, List, Any, Optional, Union, Set, Tuple
 import nuke
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..core.logging_utils import get_logger, TimerContext
+from ..core.env import get_env
 from ..core.constants import META_CREATOR, META_CREATED, META_MODIFIED, META_VERSION
 
 logger = get_logger(__name__)
 
+# Labels that look like a JSON object and may carry custom metadata
+_JSON_LABEL_RE = re.compile(r'^\{.*\}\Z', re.DOTALL)
+
+# Supported metadata knob types: knob class and value cast
+_KNOB_DISPATCH = {
+    'String_Knob': (nuke.String_Knob, str),
+    'Text_Knob': (nuke.Text_Knob, str),
+    'Boolean_Knob': (nuke.Boolean_Knob, bool),
+    'Int_Knob': (nuke.Int_Knob, int),
+    'Float_Knob': (nuke.Float_Knob, float),
+}
+
+@lru_cache(maxsize=256)
+def _knob_label(key: str) -> str:
+    """Display label for a metadata key"""
+    return key.replace('_', ' ').title()
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str, separators=(',', ':')).encode('utf-8')
+
+# Per-node columns of the 'nodes' section returned by extract_script_metadata
+NODE_FIELDS = ('names', 'classes', 'positions', 'colors', 'disabled',
+               'knobs', 'connections', 'custom')
+
+def _node_row(node_meta: Dict) -> Tuple:
+    """One node's extract_node_metadata output as values in NODE_FIELDS order"""
+    basic = node_meta['basic']
+    return (basic['name'], basic['class'], basic['position'], basic['color'],
+            basic['disabled'], node_meta['knobs'], node_meta['connections'],
+            node_meta['custom'])
+
+def _aos_view(data: Dict):
+    """
+    Lazily rebuild per-node metadata dicts from extract_script_metadata output
+    
+    Args:
+        data: Script metadata (or its 'nodes' section)
+        
+    Yields:
+        (node_name, node_metadata) pairs in the extract_node_metadata layout
+    """
+    nodes = data.get('nodes', data)
+    for i, name in enumerate(nodes['names']):
+        yield name, {
+            'basic': {
+                'name': name,
+                'class': nodes['classes'][i],
+                'position': nodes['positions'][i],
+                'color': nodes['colors'][i],
+                'disabled': nodes['disabled'][i],
+            },
+            'knobs': nodes['knobs'][i],
+            'connections': nodes['connections'][i],
+            'custom': nodes['custom'][i]
+        }
+
 class MetadataManager:
     """Manager for Nuke metadata operations"""
     
@@ -24,45 +93,72 @@ class MetadataManager:
     
     def extract_node_metadata(self, node: 'nuke.Node') -> Dict:
         """Extract metadata from a node"""
-        metadata = {
+        knobs = node.knobs()
+        tile_color = knobs.get('tile_color')
+        disable = knobs.get('disable')
+        
+        knob_data, custom_data = self._scan_knobs(knobs)
+        custom_data.update(self._extract_label_metadata(knobs.get('label')))
+        
+        # Extract input connections
+        inputs = {}
+        input_at = node.input
+        for i in range(node.inputs()):
+            input_node = input_at(i)
+            if input_node:
+                inputs[f'input{i}'] = input_node.name()
+        
+        return {
             'basic': {
                 'name': node.name(),
                 'class': node.Class(),
                 'position': (node.xpos(), node.ypos()),
-                'color': node['tile_color'].value() if node.knob('tile_color') else 0,
-                'disabled': node['disable'].value() if node.knob('disable') else False,
+                'color': tile_color.value() if tile_color else 0,
+                'disabled': disable.value() if disable else False,
             },
-            'knobs': {},
-            'connections': {},
-            'custom': {}
+            'knobs': knob_data,
+            'connections': {'inputs': inputs},
+            'custom': custom_data
         }
+    
+    def _scan_knobs(self, knobs: Dict[str, 'nuke.Knob']) -> Tuple[Dict, Dict]:
+        """
+        Collect visible knob data and prefixed custom metadata in one pass
+        
+        Args:
+            knobs: Knob table as returned by node.knobs()
+            
+        Returns:
+            (knob_data, custom_data) tuple
+        """
+        knob_data = {}
+        custom_data = {}
+        prefix = self.custom_knob_prefix
+        prefix_len = len(prefix)
+        is_animated = self._is_knob_animated
         
-        # Extract knob values
-        for knob_name in node.knobs():
-            knob = node[knob_name]
-            if knob and knob.visible():
+        for knob_name, knob in knobs.items():
+            if not knob:
+                continue
+            
+            if knob_name.startswith(prefix):
+                try:
+                    custom_data[knob_name[prefix_len:]] = knob.value()
+                except:
+                    pass
+            
+            if knob.visible():
                 try:
-                    metadata['knobs'][knob_name] = {
+                    knob_data[knob_name] = {
                         'value': knob.value(),
                         'type': knob.Class(),
                         'label': knob.label(),
-                        'is_animated': self._is_knob_animated(knob)
+                        'is_animated': is_animated(knob)
                     }
                 except:
                     pass
         
-        # Extract input connections
-        inputs = {}
-        for i in range(node.inputs()):
-            input_node = node.input(i)
-            if input_node:
-                inputs[f'input{i}'] = input_node.name()
-        metadata['connections']['inputs'] = inputs
-        
-        # Extract custom metadata from knobs
-        metadata['custom'] = self._extract_custom_metadata(node)
-        
-        return metadata
+        return knob_data, custom_data
     
     def _is_knob_animated(self, knob: 'nuke.Knob') -> bool:
         """Check if a knob is animated"""
@@ -81,33 +177,36 @@ class MetadataManager:
     def _extract_custom_metadata(self, node: 'nuke.Node') -> Dict:
         """Extract custom metadata from knobs"""
         custom_data = {}
+        prefix = self.custom_knob_prefix
+        prefix_len = len(prefix)
+        knobs = node.knobs()
         
         # Look for metadata knobs
-        for knob_name in node.knobs():
-            if knob_name.startswith(self.custom_knob_prefix):
-                knob = node[knob_name]
-                if knob:
-                    try:
-                        key = knob_name[len(self.custom_knob_prefix):]
-                        custom_data[key] = knob.value()
-                    except:
-                        pass
+        for knob_name, knob in knobs.items():
+            if knob_name.startswith(prefix) and knob:
+                try:
+                    custom_data[knob_name[prefix_len:]] = knob.value()
+                except:
+                    pass
         
         # Check for metadata in label or other fields
-        label_knob = node.knob('label')
-        if label_knob:
-            label = label_knob.value()
-            if label:
-                # Try to parse JSON from label
-                if label.startswith('{') and label.endswith('}'):
-                    try:
-                        label_data = json.loads(label)
-                        custom_data.update(label_data)
-                    except:
-                        pass
+        custom_data.update(self._extract_label_metadata(knobs.get('label')))
         
         return custom_data
     
+    def _extract_label_metadata(self, label_knob: Optional['nuke.Knob']) -> Dict:
+        """Parse JSON metadata stored in a node label"""
+        if label_knob:
+            label = label_knob.value()
+            if label and _JSON_LABEL_RE.match(label):
+                try:
+                    label_data = json.loads(label)
+                    if isinstance(label_data, dict):
+                        return label_data
+                except:
+                    pass
+        return {}
+    
     def set_node_metadata(self, node: 'nuke.Node', key: str, value: Any,
                          knob_type: str = 'String_Knob'):
         """Set metadata on a node"""
@@ -124,25 +223,15 @@ class MetadataManager:
                 return False
         
         # Create new knob
+        knob_factory = _KNOB_DISPATCH.get(knob_type)
+        if knob_factory is None:
+            logger.error(f"Unsupported knob type: {knob_type}")
+            return False
+        
         try:
-            if knob_type == 'String_Knob':
-                knob = nuke.String_Knob(knob_name, key.replace('_', ' ').title())
-                knob.setValue(str(value))
-            elif knob_type == 'Text_Knob':
-                knob = nuke.Text_Knob(knob_name, key.replace('_', ' ').title())
-                knob.setValue(str(value))
-            elif knob_type == 'Boolean_Knob':
-                knob = nuke.Boolean_Knob(knob_name, key.replace('_', ' ').title())
-                knob.setValue(bool(value))
-            elif knob_type == 'Int_Knob':
-                knob = nuke.Int_Knob(knob_name, key.replace('_', ' ').title())
-                knob.setValue(int(value))
-            elif knob_type == 'Float_Knob':
-                knob = nuke.Float_Knob(knob_name, key.replace('_', ' ').title())
-                knob.setValue(float(value))
-            else:
-                logger.error(f"Unsupported knob type: {knob_type}")
-                return False
+            knob_class, cast = knob_factory
+            knob = knob_class(knob_name, _knob_label(key))
+            knob.setValue(cast(value))
             
             # Add to node
             node.addKnob(knob)
@@ -199,9 +288,12 @@ class MetadataManager:
     
     def extract_script_metadata(self) -> Dict:
         """Extract metadata from entire script"""
+        # Node data is stored as parallel lists (one entry per node) rather
+        # than one nested dict per node; use _aos_view() for the old layout
+        nodes = {field: [] for field in NODE_FIELDS}
         metadata = {
             'script_info': self._get_script_info(),
-            'nodes': {},
+            'nodes': nodes,
             'statistics': self._get_script_statistics(),
             'versions': self._get_version_info(),
             'user_data': self._get_user_info()
@@ -211,47 +303,124 @@ class MetadataManager:
         for node in nuke.allNodes():
             try:
                 node_meta = self.extract_node_metadata(node)
-                metadata['nodes'][node.name()] = node_meta
             except Exception as e:
                 logger.error(f"Failed to extract metadata from node {node.name()}: {e}")
+                continue
+            
+            for field, value in zip(NODE_FIELDS, _node_row(node_meta)):
+                nodes[field].append(value)
         
         return metadata
     
+    def stream_script_metadata(self, fp) -> int:
+        """
+        Write script metadata as JSON to a binary file object
+        
+        The output has the same schema as extract_script_metadata (the
+        'nodes' section holds one list per NODE_FIELDS entry). This is a
+        buffered, column-by-column serializer, not a stream: each node is
+        serialized to compact JSON fragments as soon as it is read, and all
+        fragments are held until the document is written, so memory grows
+        with the node count (but stays below the metadata dicts
+        extract_script_metadata returns). Nothing is written to fp until
+        every section has been collected.
+        
+        Args:
+            fp: File object opened in binary write mode
+            
+        Returns:
+            Number of nodes written
+        """
+        columns = {field: [] for field in NODE_FIELDS}
+        count = 0
+        for node in nuke.allNodes():
+            try:
+                node_meta = self.extract_node_metadata(node)
+            except Exception as e:
+                logger.error(f"Failed to extract metadata from node {node.name()}: {e}")
+                continue
+            
+            for field, value in zip(NODE_FIELDS, _node_row(node_meta)):
+                columns[field].append(_dumps(value))
+            count += 1
+        
+        nodes_json = b'{' + b','.join(
+            _dumps(field) + b':[' + b','.join(values) + b']'
+            for field, values in columns.items()
+        ) + b'}'
+        
+        sections = (
+            (b'script_info', _dumps(self._get_script_info())),
+            (b'nodes', nodes_json),
+            (b'statistics', _dumps(self._get_script_statistics())),
+            (b'versions', _dumps(self._get_version_info())),
+            (b'user_data', _dumps(self._get_user_info())),
+        )
+        fp.write(b'{' + b','.join(b'"' + key + b'":' + value for key, value in sections) + b'}')
+        
+        return count
+    
     def _get_script_info(self) -> Dict:
         """Get script information"""
         try:
             root = nuke.root()
+            knobs = root.knobs()
+            filename = root.name()
             return {
-                'filename': root.name(),
-                'fps': root['fps'].value(),
-                'frame_range': (root['first_frame'].value(), root['last_frame'].value()),
-                'format': str(root['format'].value()),
-                'project_directory': nuke.getFileNameDirectory(root.name()),
-                'modified': self._get_file_modified_time(root.name())
+                'filename': filename,
+                'fps': knobs['fps'].value(),
+                'frame_range': (knobs['first_frame'].value(), knobs['last_frame'].value()),
+                'format': str(knobs['format'].value()),
+                'project_directory': nuke.getFileNameDirectory(filename),
+                'modified': self._get_file_modified_time(filename)
             }
         except:
             return {}
     
+    def _get_version_info(self) -> Dict:
+        """Get Nuke and Python version information"""
+        try:
+            return {
+                'nuke': get_env().get_nuke_version(),
+                'python': platform.python_version(),
+            }
+        except Exception:
+            return {}
+    
+    def _get_user_info(self) -> Dict:
+        """Get the current user and host"""
+        try:
+            return {
+                'username': get_env().get_username(),
+                'hostname': platform.node(),
+            }
+        except Exception:
+            return {}
+    
     def _get_file_modified_time(self, filepath: str) -> Optional[str]:
         """Get file modification time"""
+        if not filepath:
+            return None
         try:
-            if filepath and Path(filepath).exists():
-                mtime = Path(filepath).stat().st_mtime
-                return datetime.fromtimestamp(mtime).isoformat()
-        except:
-            pass
-        return None
+            return datetime.fromtimestamp(os.stat(filepath).st_mtime).isoformat()
+        except (OSError, ValueError):
+            return None
     
     def _get_script_statistics(self) -> Dict:
         """Get script statistics"""
         try:
             nodes = nuke.allNodes()
+            node_types = self._count_node_types(nodes)
             return {
                 'total_nodes': len(nodes),
-                'node_types': self._count_node_types(nodes),
-                'backdrops': len([n for n in nodes if n.Class() == 'BackdropNode']),
-                'read_nodes': len([n for n in nodes if n.Class() == 'Read']),
+                'node_types': node_types,
+                'backdrops': node_types.get('BackdropNode', 0),
+                'read_nodes': node_types.get('Read', 0),
             }
         except:
             pass
-        return None
\ No newline at end of file
+        return None
+    
+    def _count_node_types(self, nodes: List['nuke.Node']) -> Dict[str, int]:
+        """Count nodes per class"""
+        return dict(Counter(node.Class() for node in nodes))
\ No newline at end of file
@@ -3,29 +3,88 @@ File read/write operations for Nuke scripts and data
 """
 
 import json
+import os
 import pickle
 import yaml
 import xml.etree.ElementTree as ET
 import zipfile
 import tempfile
 import shutil
+import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple
 import nuke
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 from ..core.logging_utils import get_logger, TimerContext
 from ..core.env import get_env
 from ..core.constants import EXT_NK, EXT_JSON, EXT_YAML, EXT_XML, EXT_TXT
 
 logger = get_logger(__name__)
 
+if msgspec is not None:
+    class NodePreset(msgspec.Struct):
+        """Schema of a node preset file"""
+        node_class: str
+        node_name: str
+        knob_values: dict
+        node_data: str
+        connections: dict = {}
+
+def _write_preset(filepath: Union[str, Path], preset_data: Dict):
+    """Write node preset data as JSON, using msgspec when available"""
+    if msgspec is not None:
+        with open(filepath, 'wb') as f:
+            f.write(msgspec.json.encode(NodePreset(**preset_data)))
+        return
+    
+    with open(filepath, 'w') as f:
+        json.dump(preset_data, f, indent=2)
+
+def _read_preset(filepath: Union[str, Path]) -> Dict:
+    """Read and validate node preset JSON, using msgspec when available"""
+    if msgspec is not None:
+        with open(filepath, 'rb') as f:
+            preset = msgspec.json.decode(f.read(), type=NodePreset)
+        return msgspec.structs.asdict(preset)
+    
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+def _get_clipboard():
+    """Return the Qt clipboard if a Qt application is running, else None"""
+    try:
+        from PySide6 import QtWidgets
+    except ImportError:
+        try:
+            from PySide2 import QtWidgets
+        except ImportError:
+            return None
+    
+    app = QtWidgets.QApplication.instance()
+    return app.clipboard() if app is not None else None
+
 class NukeFileHandler:
     """Handler for Nuke file operations"""
     
+    # Backup retention, checked at most once per interval across handlers
+    max_backups = 50
+    prune_interval = 3600  # seconds
+    _last_prune = 0.0
+    
     def __init__(self):
         self.env = get_env()
         self.backup_dir = Path(self.env.get_nuke_temp_dir()) / 'backups'
         self.backup_dir.mkdir(exist_ok=True)
+        
+        now = time.time()
+        if now - NukeFileHandler._last_prune >= self.prune_interval:
+            NukeFileHandler._last_prune = now
+            self._prune_backups(self.max_backups)
     
     def read_nuke_script(self, filepath: str, 
                         load_all_formats: bool = False,
@@ -89,13 +148,13 @@ class NukeFileHandler:
                 filepath = Path(filepath)
                 
                 # Check if file exists
-                if filepath.exists():
-                    if not overwrite:
-                        logger.error(f"File exists and overwrite=False: {filepath}")
-                        return False
-                    
-                    if backup:
-                        self._backup_existing_file(filepath)
+                if not overwrite and filepath.exists():
+                    logger.error(f"File exists and overwrite=False: {filepath}")
+                    return False
+                
+                # Backup is a no-op when there is nothing to overwrite
+                if backup:
+                    self._backup_existing_file(filepath)
                 
                 # Ensure directory exists
                 filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -128,30 +187,18 @@ class NukeFileHandler:
             Success status
         """
         try:
-            # Create temp script with just this node
-            temp_file = Path(tempfile.mktemp(suffix='.nk'))
-            
-            # Copy node to new script
-            nuke.nodeCopy(str(temp_file))
-            
-            # Read back and add to dictionary
-            with open(temp_file, 'r') as f:
-                preset_data = {
-                    'node_class': node.Class(),
-                    'node_name': node.name(),
-                    'knob_values': self._extract_knob_values(node),
-                    'node_data': f.read()
-                }
+            preset_data = {
+                'node_class': node.Class(),
+                'node_name': node.name(),
+                'knob_values': self._extract_knob_values(node),
+                'node_data': self._copy_nodes_to_string()
+            }
             
             if include_connections:
                 preset_data['connections'] = self._extract_node_connections(node)
             
             # Save as JSON
-            with open(filepath, 'w') as f:
-                json.dump(preset_data, f, indent=2)
-            
-            # Cleanup
-            temp_file.unlink()
+            _write_preset(filepath, preset_data)
             
             logger.info(f"Exported node preset: {node.name()} -> {filepath}")
             return True
@@ -173,16 +220,19 @@ class NukeFileHandler:
             Created node or None
         """
         try:
-            with open(filepath, 'r') as f:
-                preset_data = json.load(f)
-            
-            # Create temp script
-            temp_file = Path(tempfile.mktemp(suffix='.nk'))
-            with open(temp_file, 'w') as f:
-                f.write(preset_data['node_data'])
+            preset_data = _read_preset(filepath)
             
-            # Paste node
-            nuke.nodePaste(str(temp_file))
+            # Paste node via a temp script, removed even if the paste fails
+            temp_file = None
+            try:
+                with tempfile.NamedTemporaryFile('w', suffix='.nk', delete=False) as tf:
+                    temp_file = Path(tf.name)
+                    tf.write(preset_data['node_data'])
+                
+                nuke.nodePaste(str(temp_file))
+            finally:
+                if temp_file is not None:
+                    temp_file.unlink(missing_ok=True)
             
             # Get the pasted node
             pasted_nodes = nuke.selectedNodes()
@@ -192,16 +242,13 @@ class NukeFileHandler:
             node = pasted_nodes[0]
             
             # Apply knob values
-            if 'knob_values' in preset_data:
+            if preset_data.get('knob_values'):
                 self._apply_knob_values(node, preset_data['knob_values'])
             
             # Position relative to parent
             if parent_node:
                 self._position_relative_to_parent(node, parent_node)
             
-            # Cleanup
-            temp_file.unlink()
-            
             logger.info(f"Imported node preset: {filepath} -> {node.name()}")
             return node
             
@@ -388,9 +435,41 @@ class NukeFileHandler:
             shutil.copy2(filepath, backup_path)
             logger.debug(f"Backed up existing file: {backup_path}")
             
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Failed to backup existing file: {e}")
     
+    def _prune_backups(self, max_keep: int = 50) -> int:
+        """
+        Remove all but the newest backups in the backup directory
+        
+        Args:
+            max_keep: Number of most recent backups to keep
+            
+        Returns:
+            Number of backups removed
+        """
+        removed = 0
+        try:
+            with os.scandir(self.backup_dir) as it:
+                entries = [entry for entry in it if entry.is_file(follow_symlinks=False)]
+            entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+            
+            for entry in entries[max_keep:]:
+                try:
+                    os.unlink(entry.path)
+                    removed += 1
+                except OSError as e:
+                    logger.debug(f"Failed to remove old backup {entry.path}: {e}")
+            
+            if removed:
+                logger.debug(f"Pruned {removed} old backups from {self.backup_dir}")
+        except OSError as e:
+            logger.warning(f"Failed to prune backups: {e}")
+        
+        return removed
+    
     def _load_all_formats(self):
         """Load all read node file formats"""
         try:
@@ -425,6 +504,29 @@ class NukeFileHandler:
         except Exception as e:
             logger.warning(f"Failed to compress file: {e}")
     
+    def _copy_nodes_to_string(self) -> str:
+        """
+        Serialize the selected nodes to .nk script text
+        
+        Goes through the system clipboard when a Qt application is running,
+        otherwise through a temporary file that is always cleaned up.
+        """
+        clipboard = _get_clipboard()
+        if clipboard is not None:
+            nuke.nodeCopy('%clipboard%')
+            return clipboard.text()
+        
+        temp_file = None
+        try:
+            with tempfile.NamedTemporaryFile('w+', suffix='.nk', delete=False) as tf:
+                temp_file = Path(tf.name)
+            
+            nuke.nodeCopy(str(temp_file))
+            return temp_file.read_text()
+        finally:
+            if temp_file is not None:
+                temp_file.unlink(missing_ok=True)
+    
     def _extract_knob_values(self, node: 'nuke.Node') -> Dict:
         """Extract knob values from node"""
         knob_values = {}
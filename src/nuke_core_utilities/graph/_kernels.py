@@ -0,0 +1,117 @@
+"""
+Compiled graph kernels (optional, requires numba)
+
+Kernels operate on integer-indexed graphs in CSR form: the neighbours of
+node i are targets[offsets[i]:offsets[i + 1]]. When numba is not
+installed AVAILABLE is False and callers use their pure-Python versions.
+"""
+
+from typing import List
+
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+    np = None
+
+AVAILABLE = numba is not None
+
+def to_csr(adjacency: List[List[int]]):
+    """
+    Pack adjacency lists into CSR arrays
+
+    Args:
+        adjacency: adjacency[i] lists the neighbour indices of node i
+
+    Returns:
+        (offsets, targets) int64 arrays
+    """
+    offsets = np.zeros(len(adjacency) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(neighbors) for neighbors in adjacency])
+    targets = np.fromiter((j for neighbors in adjacency for j in neighbors),
+                          dtype=np.int64, count=int(offsets[-1]))
+    return offsets, targets
+
+if AVAILABLE:
+    @numba.njit(cache=True, parallel=True)
+    def brandes_csr(n, offsets, targets):
+        """Unnormalized betweenness centrality, sources scored in parallel"""
+        scores = np.zeros(n)
+        for source in numba.prange(n):
+            sigma = np.zeros(n)
+            dist = np.full(n, -1, dtype=np.int64)
+            order = np.empty(n, dtype=np.int64)
+            sigma[source] = 1.0
+            dist[source] = 0
+            order[0] = source
+            head = 0
+            tail = 1
+
+            # BFS counting shortest paths; order doubles as the queue
+            while head < tail:
+                current = order[head]
+                head += 1
+                for e in range(offsets[current], offsets[current + 1]):
+                    dependent = targets[e]
+                    if dist[dependent] < 0:
+                        dist[dependent] = dist[current] + 1
+                        order[tail] = dependent
+                        tail += 1
+                    if dist[dependent] == dist[current] + 1:
+                        sigma[dependent] += sigma[current]
+
+            # Accumulate dependencies over shortest-path successors
+            delta = np.zeros(n)
+            for k in range(tail - 1, 0, -1):
+                current = order[k]
+                for e in range(offsets[current], offsets[current + 1]):
+                    dependent = targets[e]
+                    if dist[dependent] == dist[current] + 1:
+                        delta[current] += sigma[current] / sigma[dependent] * (1.0 + delta[dependent])
+
+            scores += delta
+        return scores
+
+    @numba.njit(cache=True)
+    def reach_bitsets_u64(offsets, targets, sweep):
+        """
+        Reachability rows of 64-bit words, one row per node
+
+        Nodes are processed in sweep order and every neighbour must be
+        processed before the node itself.
+        """
+        n = offsets.shape[0] - 1
+        words = (n + 63) // 64
+        bits = np.zeros((n, words), dtype=np.uint64)
+        for k in range(sweep.shape[0]):
+            i = sweep[k]
+            bits[i, i >> 6] |= np.uint64(1) << np.uint64(i & 63)
+            for e in range(offsets[i], offsets[i + 1]):
+                j = targets[e]
+                for w in range(words):
+                    bits[i, w] |= bits[j, w]
+        return bits
+else:
+    brandes_csr = None
+    reach_bitsets_u64 = None
+
+def betweenness(succ: List[List[int]]) -> List[float]:
+    """Compiled counterpart of traversal._brandes_betweenness"""
+    offsets, targets = to_csr(succ)
+    return brandes_csr(len(succ), offsets, targets).tolist()
+
+def reach_bitsets(adjacency: List[List[int]], sweep: List[int]):
+    """
+    Reachability of every node as rows of uint64 words
+
+    Args:
+        adjacency: adjacency[i] lists the neighbour indices of node i
+        sweep: Node indices ordered so neighbours come before each node
+
+    Returns:
+        (n, ceil(n / 64)) uint64 array; bit j of row i is set when j is
+        reachable from i (i itself included)
+    """
+    offsets, targets = to_csr(adjacency)
+    return reach_bitsets_u64(offsets, targets, np.asarray(sweep, dtype=np.int64))
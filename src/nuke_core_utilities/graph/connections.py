@@ -2,27 +2,99 @@
 Node connection management and analysis
 """
 
-from collections import defaultdict, deque
-from typing import Dict, List, Tuple, Set, Optional, Any
+import logging
+from collections import defaultdict, namedtuple
+from functools import wraps
+from typing import Dict, List, Tuple, Set, Optional, Any, Callable
 import nuke
 
 from ..core.logging_utils import get_logger, TimerContext
-from ..data.cache import cached_function
+from ..core.undo import undo_group
 
 logger = get_logger(__name__)
 
+# Column layout of get_node_connections results (one tuple per field)
+InputConnections = namedtuple('InputConnections', 'indices names classes connected')
+OutputConnections = namedtuple('OutputConnections', 'names classes input_index')
+
+def _live_graph_read(func: Callable):
+    """
+    Scope a graph reader's caches to one public call
+    
+    This is the package's staleness rule for graph data: nothing read from
+    the node graph outlives the public call that read it. The decorated
+    method's owner provides a _read_depth counter and a _clear_caches()
+    method (ConnectionManager, GraphTraversal). Caches are cleared when the
+    outermost decorated call starts and again when it returns, so nested
+    calls share reads, separate calls always see the live graph, and
+    long-lived instances (the module-level singletons) hold no graph data
+    between calls.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not self._read_depth:
+            self._clear_caches()
+        self._read_depth += 1
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self._read_depth -= 1
+            if not self._read_depth:
+                self._clear_caches()
+    return wrapper
+
 class ConnectionManager:
-    """Manager for node connections"""
+    """
+    Manager for node connections
+    
+    Graph bookkeeping (visited sets, caches, adjacency) is keyed by the
+    nuke.Node objects themselves rather than id(node): Nuke returns a new
+    Python wrapper from every input()/dependent() call, so identity is not
+    stable while Node hashing and equality are.
+    """
     
     def __init__(self):
-        self.connection_cache = {}
+        self._inputs_cache = {}
+        self._dependents_cache = {}
+        self._read_depth = 0
+    
+    def _clear_caches(self):
+        """Drop cached inputs and dependents"""
+        self._inputs_cache.clear()
+        self._dependents_cache.clear()
+    
+    def _inputs_of(self, node: 'nuke.Node') -> Tuple[Optional['nuke.Node'], ...]:
+        """Input nodes of a node, one entry per input slot (None if empty)"""
+        inputs = self._inputs_cache.get(node)
+        if inputs is None:
+            input_at = node.input
+            inputs = tuple(input_at(i) for i in range(node.inputs()))
+            self._inputs_cache[node] = inputs
+        return inputs
+    
+    def _dependents_of(self, node: 'nuke.Node') -> Tuple['nuke.Node', ...]:
+        """Nodes that depend on a node"""
+        dependents = self._dependents_cache.get(node)
+        if dependents is None:
+            dependents = tuple(node.dependent())
+            self._dependents_cache[node] = dependents
+        return dependents
     
-    @cached_function(ttl=300)
+    def _snapshot(self, node: 'nuke.Node') -> Tuple[Tuple, Tuple]:
+        """(inputs, dependents) of a node, cached for the current call"""
+        return self._inputs_of(node), self._dependents_of(node)
+    
+    @_live_graph_read
     def get_node_connections(self, node: 'nuke.Node', 
                            direction: str = 'both') -> Dict:
         """
         Get all connections for a node
         
+        Each side is an immutable namedtuple of parallel tuples, one entry
+        per connection: 'inputs' is an InputConnections (one entry per input
+        slot, name/class None when empty) and 'outputs' an OutputConnections
+        (input_index is the dependent's input fed by this node).
+        
         Args:
             node: Source node
             direction: 'inputs', 'outputs', or 'both'
@@ -31,48 +103,35 @@ class ConnectionManager:
             Dictionary of connections
         """
         connections = {
-            'inputs': {},
-            'outputs': {},
-            'all': {}
+            'inputs': InputConnections((), (), (), ()),
+            'outputs': OutputConnections((), (), ())
         }
         
         try:
             # Get input connections
             if direction in ['inputs', 'both']:
-                for i in range(node.inputs()):
-                    input_node = node.input(i)
-                    if input_node:
-                        connections['inputs'][i] = {
-                            'node': input_node.name(),
-                            'class': input_node.Class(),
-                            'connected': True
-                        }
-                    else:
-                        connections['inputs'][i] = {
-                            'node': None,
-                            'class': None,
-                            'connected': False
-                        }
+                input_nodes = self._inputs_of(node)
+                connections['inputs'] = InputConnections(
+                    tuple(range(len(input_nodes))),
+                    tuple(n.name() if n else None for n in input_nodes),
+                    tuple(n.Class() if n else None for n in input_nodes),
+                    tuple(n is not None for n in input_nodes)
+                )
             
             # Get output connections
             if direction in ['outputs', 'both']:
-                dependents = node.dependent()
-                for i, dep in enumerate(dependents):
-                    # Find which input of dependent is connected to our node
-                    for input_idx in range(dep.inputs()):
-                        if dep.input(input_idx) == node:
-                            connections['outputs'][i] = {
-                                'node': dep.name(),
-                                'class': dep.Class(),
-                                'input_index': input_idx
-                            }
-                            break
-            
-            # Combine all connections
-            connections['all'] = {
-                'inputs': connections['inputs'],
-                'outputs': connections['outputs']
-            }
+                outputs = []
+                for dep in self._dependents_of(node):
+                    # Find which input of dependent is connected to our node.
+                    # Node wrappers are not identity-stable, so this must be an
+                    # equality test; tuple.index runs it from C.
+                    try:
+                        input_idx = self._inputs_of(dep).index(node)
+                    except ValueError:
+                        continue
+                    outputs.append((dep.name(), dep.Class(), input_idx))
+                if outputs:
+                    connections['outputs'] = OutputConnections(*zip(*outputs))
             
         except Exception as e:
             logger.error(f"Failed to get connections for node {node.name()}: {e}")
@@ -95,26 +154,25 @@ class ConnectionManager:
             Success status
         """
         try:
-            # Validate indices
-            if input_index >= target.inputs():
-                logger.error(f"Target node only has {target.inputs()} inputs")
-                return False
+            # Already connected; nothing to do
+            if target.input(input_index) == source:
+                return True
             
-            # Disconnect existing connection if any
-            existing_source = target.input(input_index)
-            if existing_source:
-                self.disconnect_nodes(existing_source, target, input_index)
-            
-            # Make connection
-            target.setInput(input_index, source)
+            # setInput replaces any existing connection and reports an
+            # invalid input index by returning False
+            if not target.setInput(input_index, source):
+                logger.error(f"Cannot connect to input {input_index} of {target.name()}")
+                return False
             
-            logger.debug(f"Connected {source.name()} -> {target.name()}[{input_index}]")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Connected %s -> %s[%d]", source.name(), target.name(), input_index)
             return True
             
         except Exception as e:
             logger.error(f"Failed to connect nodes: {e}")
             return False
     
+    @_live_graph_read
     def disconnect_nodes(self, source: 'nuke.Node', target: 'nuke.Node',
                         input_index: int = None) -> bool:
         """
@@ -133,18 +191,22 @@ class ConnectionManager:
                 # Disconnect specific input
                 if target.input(input_index) == source:
                     target.setInput(input_index, None)
-                    logger.debug(f"Disconnected {source.name()} from {target.name()}[{input_index}]")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Disconnected %s from %s[%d]",
+                                     source.name(), target.name(), input_index)
                     return True
             else:
                 # Disconnect all connections from source to target
                 disconnected = False
-                for i in range(target.inputs()):
-                    if target.input(i) == source:
+                for i, input_node in enumerate(self._inputs_of(target)):
+                    if input_node is not None and input_node == source:
                         target.setInput(i, None)
                         disconnected = True
                 
                 if disconnected:
-                    logger.debug(f"Disconnected all connections from {source.name()} to {target.name()}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Disconnected all connections from %s to %s",
+                                     source.name(), target.name())
                     return True
             
             return False
@@ -172,9 +234,10 @@ class ConnectionManager:
         try:
             if existing_target:
                 # Insert between specific nodes
-                if self.disconnect_nodes(existing_source, existing_target, input_index):
-                    self.connect_nodes(existing_source, new_node, 0)
-                    self.connect_nodes(new_node, existing_target, input_index)
+                if existing_target.input(input_index) == existing_source:
+                    with undo_group("insert_node"):
+                        new_node.setInput(0, existing_source)
+                        existing_target.setInput(input_index, new_node)
                     return True
             else:
                 # Insert before all dependents
@@ -188,16 +251,18 @@ class ConnectionManager:
                         if dep.input(i) == existing_source:
                             original_connections.append((dep, i))
                 
-                # Disconnect originals and reconnect through new node
-                for dep, input_idx in original_connections:
-                    self.disconnect_nodes(existing_source, dep, input_idx)
-                    self.connect_nodes(new_node, dep, input_idx)
-                
-                # Connect source to new node
-                self.connect_nodes(existing_source, new_node, 0)
+                with undo_group("insert_node"):
+                    # Reconnect originals through new node
+                    for dep, input_idx in original_connections:
+                        dep.setInput(input_idx, new_node)
+                    
+                    # Connect source to new node
+                    new_node.setInput(0, existing_source)
                 
                 connections_made = len(original_connections)
-                logger.debug(f"Inserted {new_node.name()} affecting {connections_made} connections")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Inserted %s affecting %d connections",
+                                 new_node.name(), connections_made)
                 return connections_made > 0
             
             return False
@@ -221,33 +286,22 @@ class ConnectionManager:
             Success status
         """
         try:
-            # Store connections
-            input_connections = []
-            for i in range(old_node.inputs()):
-                input_node = old_node.input(i)
-                if input_node:
-                    input_connections.append((i, input_node))
-            
-            output_connections = defaultdict(list)
-            dependents = old_node.dependent()
-            for dep in dependents:
-                for i in range(dep.inputs()):
-                    if dep.input(i) == old_node:
-                        output_connections[i].append(dep)
-            
-            # Copy connections if requested
+            # Copy connections if requested, discovering and applying each
+            # connection in the same pass
             if copy_connections:
-                # Copy input connections
-                for input_idx, input_node in input_connections:
-                    if input_idx < new_node.inputs():
-                        self.connect_nodes(input_node, new_node, input_idx)
-                
-                # Copy output connections
-                for output_idx, deps in output_connections.items():
-                    for dep in deps:
+                with undo_group("reroute_connections"):
+                    # Copy input connections
+                    input_count = min(old_node.inputs(), new_node.inputs())
+                    for input_idx in range(input_count):
+                        input_node = old_node.input(input_idx)
+                        if input_node:
+                            new_node.setInput(input_idx, input_node)
+                    
+                    # Copy output connections
+                    for dep in old_node.dependent():
                         for dep_input_idx in range(dep.inputs()):
                             if dep.input(dep_input_idx) == old_node:
-                                self.connect_nodes(new_node, dep, dep_input_idx)
+                                dep.setInput(dep_input_idx, new_node)
             
             logger.info(f"Rerouted connections from {old_node.name()} to {new_node.name()}")
             return True
@@ -256,6 +310,7 @@ class ConnectionManager:
             logger.error(f"Failed to reroute connections: {e}")
             return False
     
+    @_live_graph_read
     def find_connection_path(self, start_node: 'nuke.Node',
                            end_node: 'nuke.Node',
                            max_depth: int = 100) -> Optional[List['nuke.Node']]:
@@ -271,31 +326,39 @@ class ConnectionManager:
             List of nodes in path or None
         """
         try:
-            # BFS search
-            queue = deque([(start_node, [start_node])])
-            visited = set([start_node])
+            # Level-by-level BFS; parent pointers double as the visited set
+            parent = {start_node: None}
+            frontier = [start_node]
             
-            while queue:
-                current, path = queue.popleft()
-                
-                if len(path) > max_depth:
-                    continue
+            for _ in range(max_depth):
+                next_frontier = []
                 
-                if current == end_node:
-                    return path
-                
-                # Check outputs
-                for dep in current.dependent():
-                    if dep not in visited:
-                        visited.add(dep)
-                        queue.append((dep, path + [dep]))
+                for current in frontier:
+                    if current == end_node:
+                        path = []
+                        while current is not None:
+                            path.append(current)
+                            current = parent[current]
+                        path.reverse()
+                        return path
+                    
+                    inputs, dependents = self._snapshot(current)
+                    
+                    # Check outputs
+                    for dep in dependents:
+                        if dep not in parent:
+                            parent[dep] = current
+                            next_frontier.append(dep)
+                    
+                    # Check inputs
+                    for input_node in inputs:
+                        if input_node and input_node not in parent:
+                            parent[input_node] = current
+                            next_frontier.append(input_node)
                 
-                # Check inputs
-                for i in range(current.inputs()):
-                    input_node = current.input(i)
-                    if input_node and input_node not in visited:
-                        visited.add(input_node)
-                        queue.append((input_node, path + [input_node]))
+                if not next_frontier:
+                    break
+                frontier = next_frontier
             
             return None
             
@@ -303,6 +366,7 @@ class ConnectionManager:
             logger.error(f"Failed to find connection path: {e}")
             return None
     
+    @_live_graph_read
     def get_upstream_nodes(self, node: 'nuke.Node',
                           include_self: bool = False) -> List['nuke.Node']:
         """
@@ -316,21 +380,21 @@ class ConnectionManager:
             List of upstream nodes
         """
         upstream = set()
+        stack = [node]
         
-        def traverse_upstream(current):
-            for i in range(current.inputs()):
-                input_node = current.input(i)
+        while stack:
+            current = stack.pop()
+            for input_node in self._inputs_of(current):
                 if input_node and input_node not in upstream:
                     upstream.add(input_node)
-                    traverse_upstream(input_node)
-        
-        traverse_upstream(node)
+                    stack.append(input_node)
         
         if include_self:
             upstream.add(node)
         
         return list(upstream)
     
+    @_live_graph_read
     def get_downstream_nodes(self, node: 'nuke.Node',
                            include_self: bool = False) -> List['nuke.Node']:
         """
@@ -344,50 +408,72 @@ class ConnectionManager:
             List of downstream nodes
         """
         downstream = set()
+        stack = [node]
         
-        def traverse_downstream(current):
-            for dep in current.dependent():
+        while stack:
+            current = stack.pop()
+            for dep in self._dependents_of(current):
                 if dep not in downstream:
                     downstream.add(dep)
-                    traverse_downstream(dep)
-        
-        traverse_downstream(node)
+                    stack.append(dep)
         
         if include_self:
             downstream.add(node)
         
         return list(downstream)
     
-    def get_island_nodes(self, node: 'nuke.Node') -> List['nuke.Node']:
+    @_live_graph_read
+    def get_island_nodes(self, node: 'nuke.Node',
+                         visited: Set['nuke.Node'] = None) -> List['nuke.Node']:
         """
         Get all nodes in the same island (connected component)
         
         Args:
             node: Starting node
+            visited: Set shared across calls; nodes in it are skipped and
+                newly reached nodes are added to it
             
         Returns:
             List of connected nodes
         """
-        visited = set()
+        return self._island_from(node, set() if visited is None else visited)
+    
+    def _island_from(self, node: 'nuke.Node', visited: Set['nuke.Node'],
+                     fwd: Dict = None, rev: Dict = None) -> List['nuke.Node']:
+        """
+        Collect the island containing node, skipping already visited nodes
+        
+        Args:
+            node: Starting node
+            visited: Shared visited set, updated in place
+            fwd: Prebuilt node -> children adjacency (None to query Nuke)
+            rev: Prebuilt node -> parents adjacency (None to query Nuke)
+            
+        Returns:
+            Nodes newly visited from node
+        """
+        outputs_of = (lambda n: fwd.get(n, ())) if fwd is not None else self._dependents_of
+        inputs_of = (lambda n: rev.get(n, ())) if rev is not None else self._inputs_of
+        
+        island = []
+        stack = [node]
         
-        def traverse(current):
+        while stack:
+            current = stack.pop()
             if current in visited:
-                return
+                continue
             visited.add(current)
+            island.append(current)
             
             # Traverse inputs
-            for i in range(current.inputs()):
-                input_node = current.input(i)
-                if input_node:
-                    traverse(input_node)
+            stack.extend(input_node for input_node in inputs_of(current) if input_node)
             
             # Traverse outputs
-            for dep in current.dependent():
-                traverse(dep)
+            stack.extend(outputs_of(current))
         
-        traverse(node)
-        return list(visited)
+        return island
     
+    @_live_graph_read
     def analyze_connection_graph(self) -> Dict:
         """
         Analyze the entire connection graph
@@ -406,10 +492,13 @@ class ConnectionManager:
                     'critical_paths': []
                 }
                 
+                # Read the graph once; everything below works on this
+                parents, children, indegrees, outdegrees = self.build_adjacency(nodes)
+                
                 # Calculate node degrees
                 for node in nodes:
-                    indegree = sum(1 for i in range(node.inputs()) if node.input(i))
-                    outdegree = len(node.dependent())
+                    indegree = indegrees[node]
+                    outdegree = outdegrees[node]
                     
                     graph['node_degrees'][node.name()] = {
                         'indegree': indegree,
@@ -432,15 +521,14 @@ class ConnectionManager:
                 visited = set()
                 for node in nodes:
                     if node not in visited:
-                        island = self.get_island_nodes(node)
+                        island = self._island_from(node, visited, children, parents)
                         graph['islands'].append({
                             'size': len(island),
                             'nodes': [n.name() for n in island]
                         })
-                        visited.update(island)
                 
                 # Find critical paths (longest chains)
-                graph['critical_paths'] = self._find_critical_paths(nodes)
+                graph['critical_paths'] = self._find_critical_paths(nodes, indegrees, children)
                 
                 return graph
                 
@@ -448,65 +536,133 @@ class ConnectionManager:
                 logger.error(f"Failed to analyze connection graph: {e}")
                 return {}
     
-    def _find_critical_paths(self, nodes: List['nuke.Node'], 
-                           top_n: int = 5) -> List[Dict]:
+    @_live_graph_read
+    def build_adjacency(self, nodes: List['nuke.Node']) -> Tuple[Dict, Dict, Dict, Dict]:
+        """
+        Build input and output adjacency for nodes in a single sweep
+        
+        Only inputs are read from Nuke; outputs are derived by inverting them.
+        
+        Args:
+            nodes: Nodes to index
+            
+        Returns:
+            (parents, children, indegree, outdegree) where parents[node]
+            lists the connected input nodes (one entry per connected slot),
+            children[node] lists the distinct nodes fed by it, and the
+            degree dicts hold the corresponding counts
+        """
+        parents = {}
+        children = {node: [] for node in nodes}
+        
+        for node in nodes:
+            node_parents = [p for p in self._inputs_of(node) if p is not None]
+            parents[node] = node_parents
+            for parent in set(node_parents):
+                children.setdefault(parent, []).append(node)
+        
+        indegree = {node: len(node_parents) for node, node_parents in parents.items()}
+        outdegree = {node: len(node_children) for node, node_children in children.items()}
+        
+        return parents, children, indegree, outdegree
+    
+    def _find_critical_paths(self, nodes: List['nuke.Node'], indegree: Dict,
+                           children: Dict, top_n: int = 5) -> List[Dict]:
         """Find the longest connection paths"""
         paths = []
+        longest_from, next_on_path = self._longest_path_table(nodes, children)
         
         # Find source nodes (no inputs)
-        source_nodes = [n for n in nodes if all(n.input(i) is None for i in range(n.inputs()))]
+        source_nodes = [n for n in nodes if indegree[n] == 0]
         
         for source in source_nodes:
-            # DFS to find longest path from this source
-            longest_path = self._find_longest_path_from(source, nodes)
-            if longest_path:
-                paths.append({
-                    'length': len(longest_path),
-                    'nodes': [n.name() for n in longest_path],
-                    'source': source.name()
-                })
+            # Walk the longest path recorded for this source
+            longest_path = [source]
+            current = next_on_path.get(source)
+            while current is not None:
+                longest_path.append(current)
+                current = next_on_path.get(current)
+            
+            paths.append({
+                'length': len(longest_path),
+                'nodes': [n.name() for n in longest_path],
+                'source': source.name()
+            })
         
         # Sort by length and return top N
         paths.sort(key=lambda x: x['length'], reverse=True)
         return paths[:top_n]
     
-    def _find_longest_path_from(self, start: 'nuke.Node',
-                              all_nodes: List['nuke.Node']) -> List['nuke.Node']:
-        """Find longest path starting from a node"""
-        longest = []
-        
-        def dfs(current, path):
-            nonlocal longest
-            current_path = path + [current]
-            
-            if len(current_path) > len(longest):
-                longest = current_path.copy()
+    def _longest_path_table(self, nodes: List['nuke.Node'],
+                            children: Dict) -> Tuple[Dict, Dict]:
+        """
+        Longest downstream path length from every node, in O(N+E)
+        
+        Nodes are ordered topologically (Kahn's algorithm) and the table is
+        filled in reverse order. Nodes on a cycle are left out of the order
+        and count as paths of length 1.
+        
+        Args:
+            nodes: Nodes in the graph
+            children: Prebuilt node -> children adjacency
             
-            # Continue with dependents
-            for dep in current.dependent():
-                if dep not in current_path:
-                    dfs(dep, current_path)
+        Returns:
+            (longest_from, next_on_path) where next_on_path[node] is the
+            child continuing the longest path, or None at the end
+        """
+        indegree = {node: 0 for node in nodes}
+        for node in nodes:
+            for child in children.get(node, ()):
+                indegree[child] = indegree.get(child, 0) + 1
+        
+        order = [node for node in nodes if indegree[node] == 0]
+        for current in order:
+            for child in children.get(current, ()):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    order.append(child)
         
-        dfs(start, [])
-        return longest
+        longest_from = {node: 1 for node in nodes}
+        next_on_path = {}
+        for current in reversed(order):
+            best_child = None
+            best_length = 0
+            for child in children.get(current, ()):
+                length = longest_from.get(child, 1)
+                if length > best_length:
+                    best_child, best_length = child, length
+            longest_from[current] = best_length + 1
+            next_on_path[current] = best_child
+        
+        return longest_from, next_on_path
 
 # Helper functions
+# Global connection manager instance
+_connection_manager = None
+
+def get_connection_manager() -> ConnectionManager:
+    """Get global connection manager"""
+    global _connection_manager
+    if _connection_manager is None:
+        _connection_manager = ConnectionManager()
+    return _connection_manager
+
 def connect_nodes(source: 'nuke.Node', target: 'nuke.Node', **kwargs) -> bool:
     """Helper function to connect nodes"""
-    manager = ConnectionManager()
+    manager = get_connection_manager()
     return manager.connect_nodes(source, target, **kwargs)
 
 def insert_node(existing_source: 'nuke.Node', new_node: 'nuke.Node', **kwargs) -> bool:
     """Helper function to insert node"""
-    manager = ConnectionManager()
+    manager = get_connection_manager()
     return manager.insert_node(existing_source, new_node, **kwargs)
 
 def get_upstream_nodes(node: 'nuke.Node', **kwargs) -> List['nuke.Node']:
     """Helper function to get upstream nodes"""
-    manager = ConnectionManager()
+    manager = get_connection_manager()
     return manager.get_upstream_nodes(node, **kwargs)
 
 def analyze_connection_graph() -> Dict:
     """Helper function to analyze connection graph"""
-    manager = ConnectionManager()
-    return manager.analyze_connection_graph()
\ No newline at end of file
+    manager = get_connection_manager()
+    return manager.analyze_connection_graph()
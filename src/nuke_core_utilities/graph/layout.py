@@ -2,13 +2,16 @@
 Node graph layout and organization utilities
 """
 
+import heapq
 import math
 import random
+from collections import defaultdict, deque
 from typing import Dict, List, Tuple, Optional, Set, Any
 import nuke
 
 from ..core.logging_utils import get_logger, TimerContext
 from ..core.constants import COLOR_UTILITY, COLOR_GROUP
+from ..core.undo import undo_group
 from .connections import ConnectionManager
 
 logger = get_logger(__name__)
@@ -76,32 +79,33 @@ class GraphLayout:
                            center: Tuple[int, int]) -> bool:
         """Apply hierarchical (tree) layout"""
         try:
+            _, children, indegree, _ = self.connection_manager.build_adjacency(nodes)
+            widths = {n: n.screenWidth() for n in nodes}
+            
             # Find source nodes (no inputs)
-            source_nodes = [
-                n for n in nodes 
-                if all(n.input(i) is None for i in range(n.inputs()))
-            ]
+            source_nodes = [n for n in nodes if indegree[n] == 0]
             
             if not source_nodes:
                 # Use nodes with lowest indegree
-                source_nodes = sorted(
-                    nodes,
-                    key=lambda n: sum(1 for i in range(n.inputs()) if n.input(i))
-                )[:min(3, len(nodes))]
+                source_nodes = heapq.nsmallest(3, nodes, key=indegree.__getitem__)
             
             # Layout each source tree
+            node_set = set(nodes)
+            positions = {}
             x_offset = center[0]
             for source in source_nodes:
                 tree_nodes = self.connection_manager.get_island_nodes(source)
-                tree_nodes = [n for n in tree_nodes if n in nodes]
+                tree_nodes = [n for n in tree_nodes if n in node_set]
                 
                 if tree_nodes:
-                    self._layout_tree(source, tree_nodes, x_offset, center[1])
+                    positions.update(self._layout_tree(
+                        source, tree_nodes, x_offset, center[1], widths, children))
                     x_offset += (
-                        max(n.screenWidth() for n in tree_nodes) + 
+                        max(widths[n] for n in tree_nodes) + 
                         self.default_spacing[0] * 2
                     )
             
+            self._apply_positions(positions)
             return True
             
         except Exception as e:
@@ -109,11 +113,33 @@ class GraphLayout:
             return False
     
     def _layout_tree(self, root: 'nuke.Node', nodes: List['nuke.Node'],
-                    start_x: int, start_y: int):
-        """Layout nodes in a tree structure"""
+                    start_x: int, start_y: int,
+                    widths: Dict['nuke.Node', int] = None,
+                    children: Dict['nuke.Node', List['nuke.Node']] = None
+                    ) -> Dict['nuke.Node', Tuple[int, int]]:
+        """
+        Compute positions for nodes in a tree structure
+        
+        Args:
+            root: Tree root node
+            nodes: Nodes belonging to the tree
+            start_x: Left edge of the tree
+            start_y: Top of the tree
+            widths: Precomputed screen widths per node
+            children: Precomputed downstream adjacency (see build_adjacency)
+            
+        Returns:
+            Dictionary of node -> (x, y)
+        """
+        if widths is None:
+            widths = {n: n.screenWidth() for n in nodes}
+        if children is None:
+            _, children, _, _ = self.connection_manager.build_adjacency(nodes)
+        
         # Group nodes by depth
         depth_groups = defaultdict(list)
         node_depths = {}
+        tree_set = set(nodes)
         
         # Calculate depths using BFS
         queue = deque([(root, 0)])
@@ -121,4 +147,28 @@ class GraphLayout:
         
         while queue:
             current, depth = queue.popleft()
-            node_depths
\ No newline at end of file
+            node_depths[current] = depth
+            depth_groups[depth].append(current)
+            
+            for child in children.get(current, ()):
+                if child in tree_set and child not in visited:
+                    visited.add(child)
+                    queue.append((child, depth + 1))
+        
+        # Place each depth level on its own row
+        positions = {}
+        h_spacing, v_spacing = self.default_spacing
+        for depth, row in depth_groups.items():
+            x = start_x
+            y = start_y + depth * v_spacing
+            for node in row:
+                positions[node] = (x, y)
+                x += widths[node] + h_spacing
+        
+        return positions
+    
+    def _apply_positions(self, positions: Dict['nuke.Node', Tuple[int, int]]):
+        """Move nodes to precomputed positions as a single undo step"""
+        with undo_group("auto_layout"):
+            for node, (x, y) in positions.items():
+                node.setXYpos(x, y)
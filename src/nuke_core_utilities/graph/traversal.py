@@ -2,21 +2,212 @@
 Graph traversal algorithms for Nuke node graphs
 """
 
+import copy
+from array import array
 from collections import deque, defaultdict
+from functools import reduce, wraps
+from operator import and_
 from typing import Dict, List, Set, Tuple, Optional, Any, Callable
 import nuke
 
 from ..core.logging_utils import get_logger, TimerContext
 from ..data.cache import cached_function
+from . import _kernels
+from .connections import _live_graph_read
 
 logger = get_logger(__name__)
 
+def _iter_set_bits(bits: int):
+    """Yield the positions of set bits in an int, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+def _brandes_betweenness(succ: List[List[int]]) -> List[float]:
+    """
+    Unnormalized betweenness centrality of an integer-indexed graph
+    
+    Brandes' algorithm: one BFS per source counts shortest paths, then a
+    reverse sweep accumulates each node's dependency.
+    
+    Args:
+        succ: succ[i] lists the successor indices of node i
+        
+    Returns:
+        Score per node index
+    """
+    n = len(succ)
+    scores = [0.0] * n
+    
+    for source in range(n):
+        # BFS counting shortest paths (sigma) and their predecessors
+        order = []
+        preds = {source: []}
+        sigma = [0] * n
+        sigma[source] = 1
+        dist = [-1] * n
+        dist[source] = 0
+        queue = deque([source])
+        
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            next_dist = dist[current] + 1
+            for dependent in succ[current]:
+                if dist[dependent] < 0:
+                    dist[dependent] = next_dist
+                    preds[dependent] = []
+                    queue.append(dependent)
+                if dist[dependent] == next_dist:
+                    sigma[dependent] += sigma[current]
+                    preds[dependent].append(current)
+        
+        # Accumulate dependencies in reverse BFS order
+        delta = dict.fromkeys(order, 0.0)
+        for current in reversed(order):
+            coeff = (1.0 + delta[current]) / sigma[current]
+            for pred in preds[current]:
+                delta[pred] += sigma[pred] * coeff
+            if current != source:
+                scores[current] += delta[current]
+    
+    return scores
+
+def _as_node_set(nodes) -> Set['nuke.Node']:
+    """Node collection as a set for O(1) membership (sets pass through)"""
+    return nodes if isinstance(nodes, (set, frozenset)) else set(nodes)
+
+def _freeze(value: Any) -> Any:
+    """Hashable stand-in for a memoization argument (lists become tuples)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+def _memoize_versioned(func: Callable):
+    """
+    Memoize a GraphTraversal method for the snapshot of the current call
+    
+    Results are stored in the instance's visited_cache under the snapshot
+    key, which is new for every outermost public call (see _ensure_snapshot),
+    so a result is only reused by calls nested in the one that computed it
+    and never outlives it. Calls with unhashable or callable arguments are
+    not memoized:
+    a callback may depend on state the snapshot does not track, and a
+    cache hit would skip calling it. Cached lists and dicts are copied on
+    the way out so callers cannot mutate them.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if any(callable(arg) for arg in args) or any(callable(v) for v in kwargs.values()):
+            return func(self, *args, **kwargs)
+        
+        self._ensure_snapshot()
+        if self._memo_key != self._snapshot_key:
+            self.visited_cache.clear()
+            self._memo_key = self._snapshot_key
+        
+        try:
+            key = (func.__name__,
+                   tuple(_freeze(arg) for arg in args),
+                   frozenset((k, _freeze(v)) for k, v in kwargs.items()))
+            hash(key)
+        except TypeError:
+            return func(self, *args, **kwargs)
+        
+        cache = self.visited_cache
+        if key in cache:
+            # Re-insert to keep the most recently used entries last
+            result = cache[key] = cache.pop(key)
+        else:
+            result = func(self, *args, **kwargs)
+            if len(cache) >= self.memo_size:
+                del cache[next(iter(cache))]
+            cache[key] = result
+        
+        if isinstance(result, dict):
+            return copy.deepcopy(result)
+        if isinstance(result, list):
+            return list(result)
+        return result
+    return wrapper
+
 class GraphTraversal:
     """Advanced graph traversal algorithms for Nuke nodes"""
     
+    memo_size = 256
+    
     def __init__(self):
         self.visited_cache = {}
+        self._memo_key = None
+        self._succ = {}
+        self._pred = {}
+        self._snapshot_key = None
+        self._snapshot_serial = 0
+        self._read_depth = 0
+    
+    def _clear_caches(self):
+        """Drop the adjacency snapshot and memoized results"""
+        self._snapshot_key = None
+        self.visited_cache.clear()
+    
+    def _ensure_snapshot(self):
+        """
+        Build the adjacency snapshot for the current public call
+        
+        Public methods are wrapped in _live_graph_read, which drops the
+        snapshot when the outermost call starts, so a snapshot is only
+        reused by the calls nested inside the one that built it. The key
+        carries a serial number that is new for every build.
+        """
+        group = nuke.thisGroup()
+        if self._snapshot_key is None or self._snapshot_key[1] != group:
+            self._snapshot(nuke.allNodes())
+            self._snapshot_serial += 1
+            self._snapshot_key = (self._snapshot_serial, group)
+    
+    def _snapshot(self, nodes: List['nuke.Node']):
+        """
+        Read the connections of nodes into successor/predecessor lists
+        
+        Only inputs are queried from Nuke; successors are derived by
+        inverting them, which avoids one node.dependent() scan per node.
+        """
+        pred = {}
+        succ = {node: [] for node in nodes}
+        for node in nodes:
+            input_at = node.input
+            node_pred = [p for p in (input_at(i) for i in range(node.inputs())) if p is not None]
+            pred[node] = node_pred
+            for parent in dict.fromkeys(node_pred):
+                succ.setdefault(parent, []).append(node)
+        self._pred = pred
+        self._succ = succ
+    
+    def _successors(self, node: 'nuke.Node') -> List['nuke.Node']:
+        """Nodes fed by node, from the snapshot when it covers node"""
+        succ = self._succ.get(node)
+        return node.dependent() if succ is None else succ
     
+    def _predecessors(self, node: 'nuke.Node') -> List['nuke.Node']:
+        """Connected inputs of node, from the snapshot when it covers node"""
+        pred = self._pred.get(node)
+        if pred is None:
+            pred = [p for p in (node.input(i) for i in range(node.inputs())) if p is not None]
+        return pred
+    
+    def _neighbors(self, node: 'nuke.Node', direction: str) -> List['nuke.Node']:
+        """Neighbours of node for 'forward', 'backward' or 'both'"""
+        if direction == 'forward':
+            return self._successors(node)
+        if direction == 'backward':
+            return self._predecessors(node)
+        return list(self._successors(node)) + list(self._predecessors(node))
+    
+    @_live_graph_read
+    @_memoize_versioned
     def bfs_traversal(self, start_node: 'nuke.Node',
                      direction: str = 'forward',
                      max_depth: int = None,
@@ -33,6 +224,7 @@ class GraphTraversal:
         Returns:
             List of visited nodes in BFS order
         """
+        self._ensure_snapshot()
         visited = []
         queue = deque([(start_node, 0)])
         visited_set = set([start_node])
@@ -50,26 +242,15 @@ class GraphTraversal:
             if max_depth and depth >= max_depth:
                 continue
             
-            # Get neighbors based on direction
-            neighbors = []
-            
-            if direction in ['forward', 'both']:
-                neighbors.extend(current.dependent())
-            
-            if direction in ['backward', 'both']:
-                for i in range(current.inputs()):
-                    input_node = current.input(i)
-                    if input_node:
-                        neighbors.append(input_node)
-            
             # Add unvisited neighbors to queue
-            for neighbor in neighbors:
+            for neighbor in self._neighbors(current, direction):
                 if neighbor not in visited_set:
                     visited_set.add(neighbor)
                     queue.append((neighbor, depth + 1))
         
         return visited
     
+    @_live_graph_read
     def dfs_traversal(self, start_node: 'nuke.Node',
                      direction: str = 'forward',
                      max_depth: int = None,
@@ -86,42 +267,36 @@ class GraphTraversal:
         Returns:
             List of visited nodes in DFS order
         """
+        self._ensure_snapshot()
         visited = []
         visited_set = set()
         
-        def dfs_recursive(current, depth):
+        # Explicit stack of (neighbour iterator, depth of those neighbours)
+        stack = [(iter([start_node]), 0)]
+        while stack:
+            neighbors, depth = stack[-1]
+            current = next(neighbors, None)
+            if current is None:
+                stack.pop()
+                continue
+            
             if current in visited_set:
-                return
+                continue
             
             if max_depth and depth > max_depth:
-                return
+                continue
             
             # Apply filter
             if filter_func and not filter_func(current):
-                return
+                continue
             
             visited_set.add(current)
             visited.append(current)
-            
-            # Get neighbors based on direction
-            neighbors = []
-            
-            if direction in ['forward', 'both']:
-                neighbors.extend(current.dependent())
-            
-            if direction in ['backward', 'both']:
-                for i in range(current.inputs()):
-                    input_node = current.input(i)
-                    if input_node:
-                        neighbors.append(input_node)
-            
-            # Recursively traverse neighbors
-            for neighbor in neighbors:
-                dfs_recursive(neighbor, depth + 1)
+            stack.append((iter(self._neighbors(current, direction)), depth + 1))
         
-        dfs_recursive(start_node, 0)
         return visited
     
+    @_live_graph_read
     def topological_sort(self, nodes: List['nuke.Node'] = None) -> List['nuke.Node']:
         """
         Topological sort of nodes (dependency order)
@@ -135,36 +310,49 @@ class GraphTraversal:
         try:
             if nodes is None:
                 nodes = nuke.allNodes()
-            
-            # Calculate indegree for each node
-            indegree = defaultdict(int)
-            for node in nodes:
-                for i in range(node.inputs()):
-                    input_node = node.input(i)
-                    if input_node and input_node in nodes:
-                        indegree[node] += 1
+            self._ensure_snapshot()
+            node_list = list(nodes)
+            count = len(node_list)
+            index = {node: i for i, node in enumerate(node_list)}
+            
+            # Successors within the set as a CSR table (targets of node i
+            # are targets[offsets[i]:offsets[i + 1]]); indegree is counted
+            # from the same edges so every decrement has a matching increment
+            offsets = array('i', [0])
+            targets = array('i')
+            indegree = array('i', [0]) * count
+            for node in node_list:
+                for dependent in self._successors(node):
+                    j = index.get(dependent)
+                    if j is not None:
+                        targets.append(j)
+                        indegree[j] += 1
+                offsets.append(len(targets))
             
             # Find nodes with indegree 0
-            queue = deque([n for n in nodes if indegree[n] == 0])
-            result = []
+            queue = deque(i for i in range(count) if indegree[i] == 0)
+            order = []
             
             while queue:
-                current = queue.popleft()
-                result.append(current)
+                i = queue.popleft()
+                order.append(i)
                 
                 # Reduce indegree of dependents
-                for dependent in current.dependent():
-                    if dependent in nodes:
-                        indegree[dependent] -= 1
-                        if indegree[dependent] == 0:
-                            queue.append(dependent)
+                for j in targets[offsets[i]:offsets[i + 1]]:
+                    indegree[j] -= 1
+                    if indegree[j] == 0:
+                        queue.append(j)
+            
+            result = [node_list[i] for i in order]
             
             # Check for cycles
-            if len(result) != len(nodes):
-                logger.warning(f"Graph has cycles: {len(nodes) - len(result)} nodes not sorted")
+            if len(order) != count:
+                logger.warning(f"Graph has cycles: {count - len(order)} nodes not sorted")
                 # Add remaining nodes
-                remaining = [n for n in nodes if n not in result]
-                result.extend(remaining)
+                placed = bytearray(count)
+                for i in order:
+                    placed[i] = 1
+                result.extend(node_list[i] for i in range(count) if not placed[i])
             
             return result
             
@@ -172,12 +360,15 @@ class GraphTraversal:
             logger.error(f"Failed topological sort: {e}")
             return nodes or []
     
-    def find_cycles(self, nodes: List['nuke.Node'] = None) -> List[List['nuke.Node']]:
+    @_live_graph_read
+    def find_cycles(self, nodes: List['nuke.Node'] = None,
+                    max_cycles: int = None) -> List[List['nuke.Node']]:
         """
         Find cycles in the graph
         
         Args:
             nodes: Nodes to analyze (None for all nodes)
+            max_cycles: Stop searching once this many cycles are found
             
         Returns:
             List of cycles (each cycle is a list of nodes)
@@ -186,43 +377,45 @@ class GraphTraversal:
             if nodes is None:
                 nodes = nuke.allNodes()
             
+            self._ensure_snapshot()
+            node_set = _as_node_set(nodes)
             cycles = []
-            visited = set()
-            recursion_stack = set()
-            parent_map = {}
             
-            def dfs_cycle(current):
-                visited.add(current)
-                recursion_stack.add(current)
+            # Node colours: absent = unvisited, GRAY = on the DFS stack,
+            # BLACK = fully explored
+            GRAY, BLACK = 1, 2
+            color = {}
+            
+            for root in nodes:
+                if root in color:
+                    continue
                 
-                # Check dependents
-                for dependent in current.dependent():
-                    if dependent not in nodes:
+                color[root] = GRAY
+                stack = [(root, iter(self._successors(root)))]
+                while stack:
+                    current, dependents = stack[-1]
+                    dependent = next(dependents, None)
+                    if dependent is None:
+                        color[current] = BLACK
+                        stack.pop()
                         continue
                     
-                    if dependent not in visited:
-                        parent_map[dependent] = current
-                        if dfs_cycle(dependent):
-                            return True
-                    elif dependent in recursion_stack:
-                        # Found a cycle
-                        cycle = []
-                        node_in_cycle = current
-                        while node_in_cycle != dependent:
-                            cycle.append(node_in_cycle)
-                            node_in_cycle = parent_map.get(node_in_cycle)
-                        cycle.append(dependent)
-                        cycle.reverse()
-                        cycles.append(cycle)
-                        return True
-                
-                recursion_stack.remove(current)
-                return False
-            
-            for node in nodes:
-                if node not in visited:
-                    parent_map.clear()
-                    dfs_cycle(node)
+                    if dependent not in node_set:
+                        continue
+                    
+                    state = color.get(dependent)
+                    if state is None:
+                        color[dependent] = GRAY
+                        stack.append((dependent, iter(self._successors(dependent))))
+                    elif state == GRAY:
+                        # Back edge: the cycle is the stack from dependent up
+                        path = [node for node, _ in stack]
+                        cycles.append(path[path.index(dependent):])
+                        if max_cycles and len(cycles) >= max_cycles:
+                            return cycles
+                        for node in path:
+                            color[node] = BLACK
+                        break
             
             return cycles
             
@@ -230,6 +423,22 @@ class GraphTraversal:
             logger.error(f"Failed to find cycles: {e}")
             return []
     
+    @_live_graph_read
+    def has_cycle(self, nodes: List['nuke.Node'] = None) -> bool:
+        """
+        Check whether the graph contains a cycle
+        
+        Stops at the first back edge instead of collecting every cycle.
+        
+        Args:
+            nodes: Nodes to analyze (None for all nodes)
+            
+        Returns:
+            True if a cycle exists
+        """
+        return bool(self.find_cycles(nodes, max_cycles=1))
+    
+    @_live_graph_read
     def find_all_paths(self, start_node: 'nuke.Node',
                       end_node: 'nuke.Node',
                       max_paths: int = 100,
@@ -246,70 +455,176 @@ class GraphTraversal:
         Returns:
             List of paths (each path is a list of nodes)
         """
+        self._ensure_snapshot()
         paths = []
         
-        def dfs_find_paths(current, current_path, visited):
-            if len(paths) >= max_paths:
-                return
-            
-            if len(current_path) > max_length:
-                return
+        if max_paths <= 0 or max_length < 1:
+            return paths
+        
+        if start_node == end_node:
+            return [[start_node]]
+        
+        # Nodes from which end_node is reachable; anything else is a dead
+        # branch and is never expanded
+        can_reach_end = {end_node}
+        queue = deque([end_node])
+        while queue:
+            for input_node in self._predecessors(queue.popleft()):
+                if input_node not in can_reach_end:
+                    can_reach_end.add(input_node)
+                    queue.append(input_node)
+        
+        if start_node not in can_reach_end:
+            return paths
+        
+        # Current path, its membership set and one dependent iterator per
+        # path node
+        path = [start_node]
+        on_path = {start_node}
+        stack = [iter(self._successors(start_node))]
+        
+        while stack and len(paths) < max_paths:
+            dependent = next(stack[-1], None)
+            if dependent is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
             
-            if current == end_node:
-                paths.append(current_path.copy())
-                return
+            if (dependent not in can_reach_end or dependent in on_path
+                    or len(path) >= max_length):
+                continue
             
-            visited.add(current)
+            if dependent == end_node:
+                paths.append(path + [dependent])
+                continue
             
-            # Explore dependents
-            for dependent in current.dependent():
-                if dependent not in visited:
-                    current_path.append(dependent)
-                    dfs_find_paths(dependent, current_path, visited)
-                    current_path.pop()
+            path.append(dependent)
+            on_path.add(dependent)
+            stack.append(iter(self._successors(dependent)))
+        
+        return paths
+    
+    @_live_graph_read
+    def find_shortest_paths(self, start_node: 'nuke.Node',
+                            end_node: 'nuke.Node',
+                            nodes: List['nuke.Node'] = None) -> List[List['nuke.Node']]:
+        """
+        Find all shortest downstream paths between two nodes
+        
+        A level-synchronous BFS records every predecessor on a shortest
+        path; paths are only materialized at the end by backtracking from
+        end_node, so the search itself costs O(V+E).
+        
+        Args:
+            start_node: Starting node
+            end_node: Target node
+            nodes: Nodes the paths may pass through (None for all nodes)
             
-            visited.remove(current)
+        Returns:
+            List of shortest paths (each path is a list of nodes)
+        """
+        self._ensure_snapshot()
+        node_set = None if nodes is None else _as_node_set(nodes)
+        
+        if start_node == end_node:
+            return [[start_node]]
+        
+        dist = {start_node: 0}
+        preds = {start_node: []}
+        frontier = [start_node]
+        
+        while frontier and end_node not in dist:
+            next_frontier = []
+            for current in frontier:
+                next_dist = dist[current] + 1
+                for dependent in self._successors(current):
+                    if node_set is not None and dependent not in node_set:
+                        continue
+                    if dependent not in dist:
+                        dist[dependent] = next_dist
+                        preds[dependent] = [current]
+                        next_frontier.append(dependent)
+                    elif dist[dependent] == next_dist:
+                        preds[dependent].append(current)
+            frontier = next_frontier
+        
+        if end_node not in dist:
+            return []
+        
+        # Backtrack from end_node over shortest-path predecessors
+        paths = []
+        stack = [(end_node, [end_node])]
+        while stack:
+            current, suffix = stack.pop()
+            if current == start_node:
+                paths.append(suffix[::-1])
+                continue
+            for pred in preds[current]:
+                stack.append((pred, suffix + [pred]))
         
-        dfs_find_paths(start_node, [start_node], set())
         return paths
     
+    @_live_graph_read
+    @_memoize_versioned
     def get_dependency_tree(self, node: 'nuke.Node',
                           max_depth: int = None) -> Dict:
         """
         Build dependency tree for a node
         
+        The tree is stored as parallel lists with one entry per tree
+        position (a node reached along several paths appears once per
+        path), in breadth-first order with the root at index 0. Use
+        dependency_tree_to_nested() for the nested dict form.
+        
         Args:
             node: Root node
             max_depth: Maximum tree depth
             
         Returns:
-            Nested dictionary representing dependency tree
+            Dictionary with 'names', 'classes', 'parents' (index of the
+            parent entry, -1 for the root) and 'depths' lists
         """
-        tree = {
-            'node': node.name(),
-            'class': node.Class(),
-            'children': [],
-            'depth': 0
-        }
+        self._ensure_snapshot()
+        
+        # Shared subtrees repeat nodes; read each name/class from Nuke once
+        name_of = {}
+        class_of = {}
         
-        def build_tree(current, parent_dict, current_depth):
-            if max_depth and current_depth >= max_depth:
-                return
+        names = []
+        classes = []
+        parents = []
+        depths = []
+        
+        queue = deque([(node, -1, 0)])
+        while queue:
+            current, parent_idx, depth = queue.popleft()
+            
+            name = name_of.get(current)
+            if name is None:
+                name = name_of[current] = current.name()
+                class_of[current] = current.Class()
+            
+            index = len(names)
+            names.append(name)
+            classes.append(class_of[current])
+            parents.append(parent_idx)
+            depths.append(depth)
+            
+            if max_depth and depth >= max_depth:
+                continue
             
             # Get dependents as children
-            for dependent in current.dependent():
-                child = {
-                    'node': dependent.name(),
-                    'class': dependent.Class(),
-                    'children': [],
-                    'depth': current_depth + 1
-                }
-                parent_dict['children'].append(child)
-                build_tree(dependent, child, current_depth + 1)
-        
-        build_tree(node, tree, 0)
-        return tree
+            for dependent in self._successors(current):
+                queue.append((dependent, index, depth + 1))
+        
+        return {
+            'names': names,
+            'classes': classes,
+            'parents': parents,
+            'depths': depths
+        }
     
+    @_live_graph_read
     def find_common_ancestors(self, nodes: List['nuke.Node']) -> List['nuke.Node']:
         """
         Find common ancestors of multiple nodes
@@ -326,16 +641,9 @@ class GraphTraversal:
         if len(nodes) == 1:
             return self.bfs_traversal(nodes[0], direction='backward')
         
-        # Get ancestors for each node
-        all_ancestors = []
-        for node in nodes:
-            ancestors = set(self.bfs_traversal(node, direction='backward'))
-            all_ancestors.append(ancestors)
-        
-        # Find intersection
-        common = set.intersection(*all_ancestors)
-        return list(common)
+        return self._find_common_reachable(nodes, 'backward')
     
+    @_live_graph_read
     def find_common_descendants(self, nodes: List['nuke.Node']) -> List['nuke.Node']:
         """
         Find common descendants of multiple nodes
@@ -352,16 +660,81 @@ class GraphTraversal:
         if len(nodes) == 1:
             return self.bfs_traversal(nodes[0], direction='forward')
         
-        # Get descendants for each node
-        all_descendants = []
-        for node in nodes:
-            descendants = set(self.bfs_traversal(node, direction='forward'))
-            all_descendants.append(descendants)
+        return self._find_common_reachable(nodes, 'forward')
+    
+    def _find_common_reachable(self, nodes: List['nuke.Node'],
+                               direction: str) -> List['nuke.Node']:
+        """Nodes reachable from every node in nodes (each node included)"""
+        index, order, bits = self._build_reachability_bitsets(nuke.allNodes(), direction)
+        try:
+            common = reduce(and_, [bits[index[node]] for node in nodes])
+        except KeyError:
+            # Nodes outside the current context; intersect traversals instead
+            reachable = [set(self.bfs_traversal(node, direction=direction)) for node in nodes]
+            return list(set.intersection(*reachable))
         
-        # Find intersection
-        common = set.intersection(*all_descendants)
-        return list(common)
+        if not isinstance(common, int):
+            # Row of uint64 words from the compiled kernel
+            common = int.from_bytes(common.astype('<u8').tobytes(), 'little')
+        
+        return [order[i] for i in _iter_set_bits(common)]
+    
+    def _build_reachability_bitsets(self, nodes: List['nuke.Node'],
+                                    direction: str = 'forward'
+                                    ) -> Tuple[Dict['nuke.Node', int], List['nuke.Node'], List[int]]:
+        """
+        Compute the reachable set of every node as an int bitset
+        
+        Nodes are numbered in topological order and each bitset is the union
+        of its neighbours' bitsets, so the whole table costs one O(V+E) pass.
+        Nodes caught in a cycle may under-report reachability.
+        
+        Args:
+            nodes: Nodes to index
+            direction: 'forward' (descendants) or 'backward' (ancestors)
+            
+        Returns:
+            (index, order, bits) where index maps node -> bit position,
+            order[i] is the node at bit i and bits[i] has a bit set for
+            every node reachable from order[i], itself included (a row of
+            uint64 words when the compiled kernels are available)
+        """
+        order = self.topological_sort(nodes)
+        index = {node: i for i, node in enumerate(order)}
+        
+        # Input adjacency by bit position
+        pred = [[] for _ in order]
+        for i, node in enumerate(order):
+            for input_node in self._predecessors(node):
+                k = index.get(input_node)
+                if k is not None:
+                    pred[i].append(k)
+        
+        if direction == 'backward':
+            # Ancestors: inputs precede a node in topological order
+            adjacency = pred
+            sweep = range(len(order))
+        else:
+            # Descendants: walk in reverse over the inverted adjacency
+            adjacency = [[] for _ in order]
+            for i, preds in enumerate(pred):
+                for k in preds:
+                    adjacency[k].append(i)
+            sweep = range(len(order) - 1, -1, -1)
+        
+        if _kernels.AVAILABLE:
+            return index, order, _kernels.reach_bitsets(adjacency, list(sweep))
+        
+        bits = [0] * len(order)
+        for i in sweep:
+            reach = 1 << i
+            for k in adjacency[i]:
+                reach |= bits[k]
+            bits[i] = reach
+        
+        return index, order, bits
     
+    @_live_graph_read
     def get_graph_components(self, nodes: List['nuke.Node'] = None) -> List[List['nuke.Node']]:
         """
         Find connected components in the graph
@@ -374,6 +747,8 @@ class GraphTraversal:
         """
         if nodes is None:
             nodes = nuke.allNodes()
+        self._ensure_snapshot()
+        node_set = _as_node_set(nodes)
         
         visited = set()
         components = []
@@ -390,15 +765,14 @@ class GraphTraversal:
                     component.append(current)
                     
                     # Add inputs
-                    for i in range(current.inputs()):
-                        input_node = current.input(i)
-                        if input_node and input_node in nodes and input_node not in visited:
+                    for input_node in self._predecessors(current):
+                        if input_node in node_set and input_node not in visited:
                             visited.add(input_node)
                             queue.append(input_node)
                     
                     # Add dependents
-                    for dependent in current.dependent():
-                        if dependent in nodes and dependent not in visited:
+                    for dependent in self._successors(current):
+                        if dependent in node_set and dependent not in visited:
                             visited.add(dependent)
                             queue.append(dependent)
                 
@@ -406,10 +780,16 @@ class GraphTraversal:
         
         return components
     
+    @_live_graph_read
     def calculate_node_centrality(self, nodes: List['nuke.Node'] = None) -> Dict[str, float]:
         """
         Calculate betweenness centrality for nodes
         
+        Shortest paths never cross connected components, so each component
+        is scored on its own with Brandes' algorithm over an integer-indexed
+        copy of its adjacency, using the compiled kernel when numba is
+        available.
+        
         Args:
             nodes: Nodes to analyze (None for all nodes)
             
@@ -418,24 +798,24 @@ class GraphTraversal:
         """
         if nodes is None:
             nodes = nuke.allNodes()
+        self._ensure_snapshot()
         
-        centrality = {node.name(): 0.0 for node in nodes}
-        node_map = {node.name(): node for node in nodes}
+        components = self.get_graph_components(nodes)
+        graphs = []
+        for component in components:
+            index = {node: i for i, node in enumerate(component)}
+            graphs.append([
+                [index[d] for d in self._successors(node) if d in index]
+                for node in component
+            ])
         
-        # For each pair of nodes, find shortest paths
-        for i, start in enumerate(nodes):
-            for end in nodes[i+1:]:
-                if start == end:
-                    continue
-                
-                # Find shortest paths
-                paths = self._find_shortest_paths(start, end, nodes)
-                
-                if paths:
-                    # Count how many paths go through each node
-                    for path in paths:
-                        for node in path[1:-1]:  # Exclude start and end
-                            centrality[node.name()] += 1.0 / len(paths)
+        scorer = _kernels.betweenness if _kernels.AVAILABLE else _brandes_betweenness
+        results = [scorer(graph) for graph in graphs]
+        
+        centrality = {}
+        for component, scores in zip(components, results):
+            for node, score in zip(component, scores):
+                centrality[node.name()] = score
         
         # Normalize
         if centrality:
@@ -446,35 +826,7 @@ class GraphTraversal:
         
         return centrality
     
-    def _find_shortest_paths(self, start: 'nuke.Node', 
-                           end: 'nuke.Node',
-                           all_nodes: List['nuke.Node']) -> List[List['nuke.Node']]:
-        """Find all shortest paths between two nodes"""
-        # BFS to find shortest path length
-        queue = deque([(start, [start])])
-        visited = set([start])
-        shortest_length = None
-        shortest_paths = []
-        
-        while queue:
-            current, path = queue.popleft()
-            
-            if current == end:
-                if shortest_length is None or len(path) == shortest_length:
-                    shortest_length = len(path)
-                    shortest_paths.append(path)
-                elif len(path) > shortest_length:
-                    break
-                continue
-            
-            # Expand to dependents
-            for dependent in current.dependent():
-                if dependent in all_nodes and dependent not in visited:
-                    visited.add(dependent)
-                    queue.append((dependent, path + [dependent]))
-        
-        return shortest_paths
-    
+    @_live_graph_read
     def get_execution_order(self, nodes: List['nuke.Node'] = None) -> List['nuke.Node']:
         """
         Get execution order for nodes (considering dependencies)
@@ -488,6 +840,8 @@ class GraphTraversal:
         if nodes is None:
             nodes = nuke.allNodes()
         
+        self._ensure_snapshot()
+        
         # Topological sort gives us dependency order
         ordered = self.topological_sort(nodes)
         
@@ -495,11 +849,19 @@ class GraphTraversal:
         def get_position_key(node):
             return (node.ypos(), node.xpos())
         
+        # Dependency depth (longest input chain) in one pass: inputs come
+        # before a node in topological order
+        depth = {}
+        for node in ordered:
+            depth[node] = max(
+                (depth[p] + 1 for p in self._predecessors(node) if p in depth),
+                default=0
+            )
+        
         # Group by depth in dependency tree
         depth_groups = defaultdict(list)
         for node in ordered:
-            depth = self._get_dependency_depth(node, nodes)
-            depth_groups[depth].append(node)
+            depth_groups[depth[node]].append(node)
         
         # Sort each group
         result = []
@@ -509,24 +871,8 @@ class GraphTraversal:
         
         return result
     
-    def _get_dependency_depth(self, node: 'nuke.Node',
-                            all_nodes: List['nuke.Node']) -> int:
-        """Calculate dependency depth of a node"""
-        max_depth = 0
-        
-        def dfs(current, visited, current_depth):
-            nonlocal max_depth
-            max_depth = max(max_depth, current_depth)
-            
-            for i in range(current.inputs()):
-                input_node = current.input(i)
-                if input_node and input_node in all_nodes and input_node not in visited:
-                    visited.add(input_node)
-                    dfs(input_node, visited, current_depth + 1)
-        
-        dfs(node, set([node]), 0)
-        return max_depth
-    
+    @_live_graph_read
+    @_memoize_versioned
     def find_critical_path(self, nodes: List['nuke.Node'] = None) -> List['nuke.Node']:
         """
         Find the critical path (longest dependency chain)
@@ -540,58 +886,101 @@ class GraphTraversal:
         if nodes is None:
             nodes = nuke.allNodes()
         
+        self._ensure_snapshot()
+        
         # Find source nodes
-        source_nodes = [n for n in nodes if all(n.input(i) is None for i in range(n.inputs()))]
+        source_nodes = [n for n in nodes if not self._predecessors(n)]
+        if not source_nodes:
+            return []
         
-        longest_path = []
+        longest_from, next_on_path = self._longest_path_table(nodes)
         
-        for source in source_nodes:
-            # DFS to find longest path from this source
-            path = self._find_longest_path_from(source, nodes)
-            if len(path) > len(longest_path):
-                longest_path = path
+        # First source with the longest chain, then follow the chain
+        current = max(source_nodes, key=longest_from.__getitem__)
+        longest_path = []
+        while current is not None:
+            longest_path.append(current)
+            current = next_on_path[current]
         
         return longest_path
     
-    def _find_longest_path_from(self, start: 'nuke.Node',
-                              all_nodes: List['nuke.Node']) -> List['nuke.Node']:
-        """Find longest path starting from a node"""
-        longest = []
+    def _longest_path_table(self, nodes: List['nuke.Node']) -> Tuple[Dict, Dict]:
+        """
+        Longest downstream chain from every node, by DP over a topological order
         
-        def dfs(current, path, visited):
-            nonlocal longest
-            current_path = path + [current]
-            
-            if len(current_path) > len(longest):
-                longest = current_path.copy()
-            
-            visited.add(current)
-            
-            # Continue with dependents
-            for dep in current.dependent():
-                if dep in all_nodes and dep not in visited:
-                    dfs(dep, current_path, visited.copy())
+        Edges that point backwards in the order (only possible inside a
+        cycle) are ignored, so the result is always a simple path.
         
-        dfs(start, [], set())
-        return longest
+        Returns:
+            (longest_from, next_on_path) where longest_from[node] is the node
+            count of the longest chain starting at node and next_on_path[node]
+            the following node on it (None at the end)
+        """
+        order = self.topological_sort(nodes)
+        position = {node: i for i, node in enumerate(order)}
+        longest_from = {}
+        next_on_path = {}
+        
+        for i in range(len(order) - 1, -1, -1):
+            node = order[i]
+            best, best_next = 1, None
+            for dep in self._successors(node):
+                if position.get(dep, -1) > i and longest_from[dep] + 1 > best:
+                    best, best_next = longest_from[dep] + 1, dep
+            longest_from[node] = best
+            next_on_path[node] = best_next
+        
+        return longest_from, next_on_path
 
 # Helper functions
+def dependency_tree_to_nested(tree: Dict) -> Dict:
+    """
+    Convert a get_dependency_tree result to nested dicts
+    
+    Args:
+        tree: Parallel-list tree from get_dependency_tree
+        
+    Returns:
+        Root entry as {'node', 'class', 'children', 'depth'}, with children
+        nested the same way (empty dict for an empty tree)
+    """
+    entries = [
+        {'node': name, 'class': node_class, 'children': [], 'depth': depth}
+        for name, node_class, depth in zip(tree['names'], tree['classes'], tree['depths'])
+    ]
+    
+    for entry, parent_idx in zip(entries, tree['parents']):
+        if parent_idx >= 0:
+            entries[parent_idx]['children'].append(entry)
+    
+    return entries[0] if entries else {}
+
+# Global traversal instance
+_graph_traversal = None
+
+def get_graph_traversal() -> GraphTraversal:
+    """Get global graph traversal"""
+    global _graph_traversal
+    if _graph_traversal is None:
+        _graph_traversal = GraphTraversal()
+    return _graph_traversal
+
 def topological_sort(nodes: List['nuke.Node'] = None) -> List['nuke.Node']:
     """Helper function for topological sort"""
-    traversal = GraphTraversal()
+    traversal = get_graph_traversal()
     return traversal.topological_sort(nodes)
 
 def find_cycles(nodes: List['nuke.Node'] = None) -> List[List['nuke.Node']]:
     """Helper function to find cycles"""
-    traversal = GraphTraversal()
+    traversal = get_graph_traversal()
     return traversal.find_cycles(nodes)
 
 def get_execution_order(nodes: List['nuke.Node'] = None) -> List['nuke.Node']:
     """Helper function to get execution order"""
-    traversal = GraphTraversal()
+    traversal = get_graph_traversal()
     return traversal.get_execution_order(nodes)
 
 def find_critical_path(nodes: List['nuke.Node'] = None) -> List['nuke.Node']:
     """Helper function to find critical path"""
-    traversal = GraphTraversal()
+    traversal = get_graph_traversal()
     return traversal.find_critical_path(nodes)
\ No newline at end of file
@@ -128,62 +128,191 @@ import os
 # Node creation utilities
 # """
 
-import random
+import logging
+import tempfile
+from collections import namedtuple
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 import nuke
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from ..core.logging_utils import get_logger, TimerContext
 from ..core.constants import *
+from ..core.undo import undo_group
 from ..data.cache import cached_function
 
 logger = get_logger(__name__)
 
+# Time every create_node call; off by default since grids and templates
+# create many nodes
+PROFILE_NODE_CREATE = False
+
+# Resolved template, one tuple per field with an entry per template node
+# (positions may be shorter; connections are validated 4-tuples)
+TemplateSoA = namedtuple('TemplateSoA', 'classes names knobs positions connections')
+
+# Node count above which backdrop bounds are reduced with NumPy
+NUMPY_BOUNDS_THRESHOLD = 256
+
+def _node_bounds(nodes: List['nuke.Node']) -> Tuple[int, int, int, int]:
+    """Bounding box (min_x, min_y, max_x, max_y) of the nodes' tiles"""
+    if np is not None and len(nodes) > NUMPY_BOUNDS_THRESHOLD:
+        count = len(nodes)
+        xs = np.empty(count, np.int32)
+        ys = np.empty(count, np.int32)
+        widths = np.empty(count, np.int32)
+        heights = np.empty(count, np.int32)
+        for i, n in enumerate(nodes):
+            xs[i] = n.xpos()
+            ys[i] = n.ypos()
+            widths[i] = n.screenWidth()
+            heights[i] = n.screenHeight()
+        return (int(xs.min()), int(ys.min()),
+                int((xs + widths).max()), int((ys + heights).max()))
+    
+    min_x = min_y = float('inf')
+    max_x = max_y = float('-inf')
+    for n in nodes:
+        x, y = n.xpos(), n.ypos()
+        right, bottom = x + n.screenWidth(), y + n.screenHeight()
+        if x < min_x:
+            min_x = x
+        if y < min_y:
+            min_y = y
+        if right > max_x:
+            max_x = right
+        if bottom > max_y:
+            max_y = bottom
+    return min_x, min_y, max_x, max_y
+
+# Backslash escapes for a double-quoted TCL word; braces are escaped too so
+# an unbalanced brace in the value cannot end the enclosing node block
+_TCL_ESCAPES = str.maketrans({
+    '\\': '\\\\', '"': '\\"', '$': '\\$', '[': '\\[', ']': '\\]',
+    '{': '\\{', '}': '\\}', '\n': '\\n', '\t': '\\t',
+})
+
+def _tcl_value(value: Any) -> str:
+    """Format a knob value (or node name) for a .nk script"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return '{' + ' '.join(_tcl_value(v) for v in value) + '}'
+    
+    value = str(value)
+    if not value or any(c in value for c in ' \t\n{}[]$"\\;'):
+        return '"' + value.translate(_TCL_ESCAPES) + '"'
+    return value
+
 class NodeCreator:
     """Advanced node creation utilities"""
     
+    __slots__ = ('node_templates', '_resolved_templates')
+    
+    # Predefined node templates, built once at import time
+    NODE_TEMPLATES = {
+        'color_correction': {
+            'nodes': [
+                {'class': 'Grade', 'name': 'Grade1'},
+                {'class': 'ColorCorrect', 'name': 'ColorCorrect1'},
+                {'class': 'Clamp', 'name': 'Clamp1'}
+            ],
+            'connections': [
+                (0, 1, 0, 0),
+                (1, 2, 0, 0)
+            ],
+            'positions': [
+                (0, 0),
+                (150, 0),
+                (300, 0)
+            ]
+        },
+        'keying_setup': {
+            'nodes': [
+                {'class': 'Keyer', 'name': 'Keyer1'},
+                {'class': 'IBKColour', 'name': 'IBKColour1'},
+                {'class': 'IBKGizmo', 'name': 'IBKGizmo1'},
+                {'class': 'Merge2', 'name': 'Merge1', 'knobs': {'operation': 'mask'}}
+            ],
+            'connections': [
+                (0, 3, 0, 0),
+                (1, 3, 0, 1),
+                (2, 3, 0, 2)
+            ],
+            'positions': [
+                (0, 0),
+                (0, 100),
+                (0, 200),
+                (150, 100)
+            ]
+        }
+    }
+    
     def __init__(self):
         self.node_templates = {}
+        self._resolved_templates = {}
         self._load_node_templates()
     
     def _load_node_templates(self):
         """Load predefined node templates"""
-        self.node_templates = {
-            'color_correction': {
-                'nodes': [
-                    {'class': 'Grade', 'name': 'Grade1'},
-                    {'class': 'ColorCorrect', 'name': 'ColorCorrect1'},
-                    {'class': 'Clamp', 'name': 'Clamp1'}
-                ],
-                'connections': [
-                    (0, 1, 0, 0),
-                    (1, 2, 0, 0)
-                ],
-                'positions': [
-                    (0, 0),
-                    (150, 0),
-                    (300, 0)
-                ]
-            },
-            'keying_setup': {
-                'nodes': [
-                    {'class': 'Keyer', 'name': 'Keyer1'},
-                    {'class': 'IBKColour', 'name': 'IBKColour1'},
-                    {'class': 'IBKGizmo', 'name': 'IBKGizmo1'},
-                    {'class': 'Merge2', 'name': 'Merge1', 'knobs': {'operation': 'mask'}}
-                ],
-                'connections': [
-                    (0, 3, 0, 0),
-                    (1, 3, 0, 1),
-                    (2, 3, 0, 2)
-                ],
-                'positions': [
-                    (0, 0),
-                    (0, 100),
-                    (0, 200),
-                    (150, 100)
-                ]
-            }
-        }
+        # Shallow copy so templates registered on one instance stay local
+        self.node_templates = dict(self.NODE_TEMPLATES)
+        
+        # Flatten and validate the built-in templates up front
+        for template_name in self.node_templates:
+            self._resolve_template(template_name)
+    
+    def _resolve_template(self, template_name: str) -> Optional[TemplateSoA]:
+        """
+        Flatten a template into parallel tuples, cached per template name
+        
+        Args:
+            template_name: Template name
+            
+        Returns:
+            TemplateSoA or None if not found
+        """
+        template = self.node_templates.get(template_name)
+        if not template:
+            return None
+        
+        # Entries are keyed by name but tied to the template object, so
+        # replacing a template in node_templates invalidates its entry
+        cached = self._resolved_templates.get(template_name)
+        if cached is not None and cached[0] is template:
+            return cached[1]
+        
+        node_defs = template['nodes']
+        
+        # Keep only well-formed (source, target, source_output, target_input)
+        # connections so create_template can apply them unchecked
+        node_count = len(node_defs)
+        connections = []
+        for conn in template.get('connections', ()):
+            if (len(conn) == 4 and
+                0 <= conn[0] < node_count and
+                0 <= conn[1] < node_count):
+                connections.append(tuple(conn))
+            else:
+                logger.warning("Ignoring invalid connection %s in template '%s'", conn, template_name)
+        
+        resolved = TemplateSoA(
+            classes=tuple(d['class'] for d in node_defs),
+            names=tuple(d['name'] for d in node_defs),
+            knobs=tuple(d.get('knobs') for d in node_defs),
+            positions=tuple(template.get('positions', ())),
+            connections=tuple(connections)
+        )
+        self._resolved_templates[template_name] = (template, resolved)
+        return resolved
     
     def create_node(self, node_class: str, 
                    name: str = None,
@@ -203,38 +332,68 @@ class NodeCreator:
         Returns:
             Created node or None
         """
-        with TimerContext(f"create_node_{node_class}", logger):
+        if PROFILE_NODE_CREATE:
+            timer = TimerContext(f"create_node_{node_class}", logger)
+        else:
+            timer = nullcontext()
+        
+        with timer:
             try:
-                # Create node
-                node = nuke.createNode(node_class)
+                # Fast path: create, name and place the node in one call,
+                # without opening a properties panel. User knobs are applied
+                # afterwards so a bad knob is skipped rather than failing
+                # the constructor after the node already exists.
+                kwargs = {}
+                if name:
+                    kwargs['name'] = name
+                if position:
+                    kwargs['xpos'], kwargs['ypos'] = position
+                if color is not None:
+                    kwargs['tile_color'] = color
                 
-                if not node:
-                    return None
+                # Only an unknown class falls back to createNode
+                try:
+                    factory = getattr(nuke.nodes, node_class)
+                except AttributeError:
+                    logger.debug("nuke.nodes has no %s, using createNode", node_class)
+                    factory = None
                 
-                # Set name if provided
-                if name:
-                    node.setName(name)
+                node = factory(**kwargs) if factory is not None else None
                 
-                # Set position if provided
-                if position:
-                    node.setXpos(position[0])
-                    node.setYpos(position[1])
+                if not node:
+                    # Create node
+                    node = nuke.createNode(node_class, inpanel=False)
+                    
+                    if not node:
+                        return None
+                    
+                    # Set name if provided
+                    if name:
+                        node.setName(name)
+                    
+                    # Set position if provided
+                    if position:
+                        node.setXpos(position[0])
+                        node.setYpos(position[1])
                 
                 # Set knob values
                 if knobs:
                     self._set_knob_values(node, knobs)
                 
-                # Set color if provided
+                # Set color if provided (after knobs, so it wins over a
+                # tile_color entry in knobs)
                 if color is not None:
                     self._set_node_color(node, color)
                 
-                logger.debug(f"Created node: {node_class} -> {node.name()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Created node: %s -> %s", node_class, node.name())
                 return node
                 
             except Exception as e:
-                logger.error(f"Failed to create node {node_class}: {e}")
+                logger.error("Failed to create node %s: %s", node_class, e)
                 return None
     
+    @undo_group("create_node_group")
     def create_node_group(self, nodes: List['nuke.Node'] = None,
                          name: str = "Group1",
                          position: Tuple[int, int] = None,
@@ -252,21 +411,17 @@ class NodeCreator:
             Created group or None
         """
         try:
+            # Store original selection
+            original_selection = nuke.selectedNodes()
             if nodes is None:
-                nodes = nuke.selectedNodes()
+                nodes = original_selection
             
             if not nodes:
                 logger.warning("No nodes to group")
                 return None
             
-            # Store original selection
-            original_selection = nuke.selectedNodes()
-            
             # Select nodes to group
-            nuke.selectAll()
-            nuke.invertSelection()
-            for node in nodes:
-                node.setSelected(True)
+            self._set_exact_selection(nodes)
             
             # Create group
             group = nuke.collapseToGroup()
@@ -281,16 +436,13 @@ class NodeCreator:
             self._set_node_color(group, color)
             
             # Restore original selection
-            nuke.selectAll()
-            nuke.invertSelection()
-            for node in original_selection:
-                node.setSelected(True)
+            self._set_exact_selection(original_selection)
             
-            logger.info(f"Created group '{name}' with {len(nodes)} nodes")
+            logger.info("Created group '%s' with %d nodes", name, len(nodes))
             return group
             
         except Exception as e:
-            logger.error(f"Failed to create group: {e}")
+            logger.error("Failed to create group: %s", e)
             return None
     
     def create_backdrop(self, nodes: List['nuke.Node'] = None,
@@ -328,15 +480,11 @@ class NodeCreator:
                 return backdrop
             
             # Calculate bounds
-            x_positions = [n.xpos() for n in nodes]
-            y_positions = [n.ypos() for n in nodes]
-            widths = [n.screenWidth() for n in nodes]
-            heights = [n.screenHeight() for n in nodes]
-            
-            min_x = min(x_positions) - 20
-            min_y = min(y_positions) - 20
-            max_x = max(x + w for x, w in zip(x_positions, widths)) + 20
-            max_y = max(y + h for y, h in zip(y_positions, heights)) + 20
+            min_x, min_y, max_x, max_y = _node_bounds(nodes)
+            min_x -= 20
+            min_y -= 20
+            max_x += 20
+            max_y += 20
             
             # Create backdrop
             backdrop = nuke.nodes.BackdropNode(
@@ -350,13 +498,14 @@ class NodeCreator:
                 z_order=z_order
             )
             
-            logger.debug(f"Created backdrop around {len(nodes)} nodes")
+            logger.debug("Created backdrop around %d nodes", len(nodes))
             return backdrop
             
         except Exception as e:
-            logger.error(f"Failed to create backdrop: {e}")
+            logger.error("Failed to create backdrop: %s", e)
             return None
     
+    @undo_group("create_template")
     def create_template(self, template_name: str,
                        position: Tuple[int, int] = None,
                        name_prefix: str = "") -> List['nuke.Node']:
@@ -371,56 +520,48 @@ class NodeCreator:
         Returns:
             List of created nodes
         """
-        template = self.node_templates.get(template_name)
-        if not template:
-            logger.error(f"Template not found: {template_name}")
+        template = self._resolve_template(template_name)
+        if template is None:
+            logger.error("Template not found: %s", template_name)
             return []
         
+        node_count = len(template.classes)
+        
         try:
-            created_nodes = []
+            # Absolute positions; nodes without a template offset use
+            # the base position
+            if position:
+                base_x, base_y = position
+                abs_positions = [(base_x + dx, base_y + dy) for dx, dy in template.positions]
+                abs_positions.extend([position] * (node_count - len(abs_positions)))
+            else:
+                abs_positions = [None] * node_count
+            
+            specs = list(zip(
+                template.classes,
+                [f"{name_prefix}{base_name}" for base_name in template.names],
+                abs_positions,
+                template.knobs
+            ))
             
             # Create nodes
-            for i, node_def in enumerate(template['nodes']):
-                node_class = node_def['class']
-                node_name = f"{name_prefix}{node_def['name']}"
-                
-                # Calculate position
-                if position and 'positions' in template and i < len(template['positions']):
-                    node_pos = (
-                        position[0] + template['positions'][i][0],
-                        position[1] + template['positions'][i][1]
-                    )
-                else:
-                    node_pos = position
-                
-                # Create node
-                node = self.create_node(
-                    node_class,
-                    name=node_name,
-                    position=node_pos,
-                    knobs=node_def.get('knobs', {})
-                )
-                
-                if node:
-                    created_nodes.append(node)
-            
-            # Create connections
-            if 'connections' in template:
-                for conn in template['connections']:
-                    if (len(conn) >= 4 and 
-                        conn[0] < len(created_nodes) and 
-                        conn[1] < len(created_nodes)):
-                        source = created_nodes[conn[0]]
-                        target = created_nodes[conn[1]]
-                        target.setInput(conn[3], source)
-            
-            logger.info(f"Created template '{template_name}' with {len(created_nodes)} nodes")
+            created_nodes = self._create_nodes(specs)
+            
+            # Create connections; indices only line up if every node was created
+            if len(created_nodes) == node_count:
+                for src_i, tgt_i, src_out, tgt_in in template.connections:
+                    created_nodes[tgt_i].setInput(tgt_in, created_nodes[src_i])
+            elif template.connections:
+                logger.warning("Skipping connections for partially created template '%s'", template_name)
+            
+            logger.info("Created template '%s' with %d nodes", template_name, len(created_nodes))
             return created_nodes
             
         except Exception as e:
-            logger.error(f"Failed to create template {template_name}: {e}")
+            logger.error("Failed to create template %s: %s", template_name, e)
             return []
     
+    @undo_group("create_node_grid")
     def create_node_grid(self, node_class: str,
                         rows: int = 3,
                         cols: int = 3,
@@ -441,33 +582,40 @@ class NodeCreator:
         Returns:
             List of created nodes
         """
-        nodes = []
-        
         try:
+            # Bind the class placeholder once; patterns without
+            # placeholders are used as-is
+            if '{' in naming_pattern:
+                format_name = partial(naming_pattern.format, **{'class': node_class})
+            else:
+                format_name = None
+            
+            start_x, start_y = start_position
+            dx, dy = spacing
+            x_positions = [start_x + col * dx for col in range(cols)]
+            
+            specs = [None] * (rows * cols)
+            k = 0
             for row in range(rows):
-                for col in range(cols):
-                    position = (
-                        start_position[0] + col * spacing[0],
-                        start_position[1] + row * spacing[1]
-                    )
+                y = start_y + row * dy
+                for col, x in enumerate(x_positions):
+                    if format_name is not None:
+                        name = format_name(row=row + 1, col=col + 1)
+                    else:
+                        name = naming_pattern
                     
-                    name = naming_pattern.format(
-                        node_class,
-                        row=row + 1,
-                        col=col + 1
-                    )
-                    
-                    node = self.create_node(node_class, name=name, position=position)
-                    if node:
-                        nodes.append(node)
+                    specs[k] = (node_class, name, (x, y), None)
+                    k += 1
             
-            logger.debug(f"Created {len(nodes)} {node_class} nodes in grid")
+            nodes = self._create_nodes(specs)
+            logger.debug("Created %d %s nodes in grid", len(nodes), node_class)
             return nodes
             
         except Exception as e:
-            logger.error(f"Failed to create node grid: {e}")
+            logger.error("Failed to create node grid: %s", e)
             return []
     
+    @undo_group("duplicate_nodes")
     def duplicate_nodes(self, nodes: List['nuke.Node'] = None,
                        offset: Tuple[int, int] = (100, 0),
                        connect_inputs: bool = False,
@@ -484,21 +632,24 @@ class NodeCreator:
         Returns:
             List of duplicated nodes
         """
+        # Store original selection
+        original_selection = nuke.selectedNodes()
         if nodes is None:
-            nodes = nuke.selectedNodes()
+            nodes = original_selection
         
         if not nodes:
             return []
         
+        # Unconnected copies can be built directly from knob values
+        if not connect_inputs and not connect_outputs:
+            duplicated = self._duplicate_direct(nodes, offset)
+            if duplicated is not None:
+                logger.debug("Duplicated %d nodes", len(duplicated))
+                return duplicated
+        
         try:
-            # Store original selection
-            original_selection = nuke.selectedNodes()
-            
             # Select nodes to duplicate
-            nuke.selectAll()
-            nuke.invertSelection()
-            for node in nodes:
-                node.setSelected(True)
+            self._set_exact_selection(nodes)
             
             # Copy and paste
             nuke.nodeCopy("%clipboard%")
@@ -515,49 +666,189 @@ class NodeCreator:
                     node.setYpos(original.ypos() + offset[1])
             
             # Restore original selection
-            nuke.selectAll()
-            nuke.invertSelection()
-            for node in original_selection:
-                node.setSelected(True)
+            self._set_exact_selection(original_selection)
             
-            logger.debug(f"Duplicated {len(duplicated)} nodes")
+            logger.debug("Duplicated %d nodes", len(duplicated))
             return duplicated
             
         except Exception as e:
-            logger.error(f"Failed to duplicate nodes: {e}")
+            logger.error("Failed to duplicate nodes: %s", e)
+            return []
+    
+    # Knobs a direct duplicate must not copy from the original
+    _DUPLICATE_SKIP_KNOBS = frozenset(('name', 'xpos', 'ypos', 'selected'))
+    
+    def _duplicate_direct(self, nodes: List['nuke.Node'],
+                          offset: Tuple[int, int]) -> Optional[List['nuke.Node']]:
+        """
+        Duplicate nodes via nuke.nodes.<Class> without a clipboard round-trip
+        
+        Only handles plain nodes: no groups, no animated or expression-driven
+        knobs and no connections between the nodes being copied.
+        
+        Returns:
+            Duplicated nodes, or None if the clipboard path is needed
+        """
+        node_set = set(nodes)
+        knob_values = []
+        try:
+            for node in nodes:
+                if isinstance(node, nuke.Group):
+                    return None
+                if any(node.input(i) in node_set for i in range(node.inputs())):
+                    return None
+                
+                values = {}
+                for knob_name, knob in node.knobs().items():
+                    if knob_name in self._DUPLICATE_SKIP_KNOBS or not knob.notDefault():
+                        continue
+                    # value() only holds the current frame; keyframes and
+                    # expressions need the clipboard copy
+                    if isinstance(knob, nuke.Array_Knob) and (
+                            knob.isAnimated() or knob.hasExpression()):
+                        return None
+                    values[knob_name] = knob.value()
+                knob_values.append(values)
+        except Exception as e:
+            logger.debug("Cannot duplicate directly, using clipboard: %s", e)
+            return None
+        
+        duplicated = []
+        try:
+            for node, values in zip(nodes, knob_values):
+                copy = getattr(nuke.nodes, node.Class())(**values)
+                copy.setXYpos(node.xpos() + offset[0], node.ypos() + offset[1])
+                duplicated.append(copy)
+        except Exception as e:
+            logger.debug("Direct duplication failed, using clipboard: %s", e)
+            for copy in duplicated:
+                nuke.delete(copy)
+            return None
+        
+        return duplicated
+    
+    def _create_nodes(self, specs: List[Tuple[str, str, Optional[Tuple[int, int]],
+                                              Optional[Dict[str, Any]]]]) -> List['nuke.Node']:
+        """
+        Create several nodes at once
+        
+        The nodes are written to a temporary .nk script and pasted in one
+        call, which runs Nuke's per-node creation overhead once for the
+        batch. Falls back to create_node per spec if the paste fails.
+        
+        Args:
+            specs: (class, name, position, knobs) per node
+            
+        Returns:
+            Created nodes, in spec order
+        """
+        if not specs:
             return []
+        
+        lines = []
+        for node_class, name, position, knobs in specs:
+            lines.append(f"{node_class} {{")
+            lines.append(" inputs 0")
+            if knobs:
+                for knob_name, value in knobs.items():
+                    lines.append(f" {knob_name} {_tcl_value(value)}")
+            if name:
+                lines.append(f" name {_tcl_value(name)}")
+            if position:
+                lines.append(f" xpos {position[0]}")
+                lines.append(f" ypos {position[1]}")
+            lines.append("}")
+        
+        before = set(nuke.allNodes())
+        temp_file = None
+        try:
+            with tempfile.NamedTemporaryFile('w', suffix='.nk', delete=False) as tf:
+                temp_file = Path(tf.name)
+                tf.write('\n'.join(lines) + '\n')
+            
+            # With a node selected Nuke places the paste relative to it,
+            # ignoring the xpos/ypos written above
+            self._set_exact_selection([])
+            nuke.nodePaste(str(temp_file))
+            
+            # allNodes keeps creation order, which matches the script order
+            created = [n for n in nuke.allNodes() if n not in before]
+            if len(created) == len(specs):
+                return created
+            
+            logger.warning("Pasted %d of %d nodes, creating individually", len(created), len(specs))
+        except Exception as e:
+            logger.warning("Batch node creation failed, creating individually: %s", e)
+            created = [n for n in nuke.allNodes() if n not in before]
+        finally:
+            if temp_file is not None:
+                temp_file.unlink(missing_ok=True)
+        
+        # Remove the partial paste so the fallback does not duplicate it
+        for node in created:
+            nuke.delete(node)
+        
+        created = []
+        for node_class, name, position, knobs in specs:
+            node = self.create_node(node_class, name=name, position=position, knobs=knobs)
+            if node:
+                created.append(node)
+        return created
+    
+    def _set_exact_selection(self, nodes: List['nuke.Node']):
+        """Select exactly the given nodes, deselecting only what is currently selected"""
+        for node in nuke.selectedNodes():
+            node.setSelected(False)
+        for node in nodes:
+            node.setSelected(True)
     
     def _set_knob_values(self, node: 'nuke.Node', knobs: Dict[str, Any]):
         """Set multiple knob values on a node"""
+        if not knobs:
+            return
+        
+        node_knobs = node.knobs()
         for knob_name, value in knobs.items():
-            knob = node.knob(knob_name)
-            if knob:
+            knob = node_knobs.get(knob_name)
+            if knob is not None:
                 try:
-                    knob.setValue(value)
+                    # Unchanged values would still fire knobChanged
+                    if knob.value() != value:
+                        knob.setValue(value)
                 except Exception as e:
-                    logger.debug(f"Failed to set knob {knob_name}: {e}")
+                    logger.debug("Failed to set knob %s: %s", knob_name, e)
     
     def _set_node_color(self, node: 'nuke.Node', color: int):
         """Set node tile color"""
         try:
             tile_color_knob = node.knob('tile_color')
-            if tile_color_knob:
+            if tile_color_knob and tile_color_knob.value() != color:
                 tile_color_knob.setValue(color)
         except:
             pass
 
+# Global node creator instance
+_node_creator = None
+
+def get_node_creator() -> NodeCreator:
+    """Get global node creator"""
+    global _node_creator
+    if _node_creator is None:
+        _node_creator = NodeCreator()
+    return _node_creator
+
 # Helper functions
 def create_node(node_class: str, **kwargs) -> Optional['nuke.Node']:
     """Helper function to create node"""
-    creator = NodeCreator()
+    creator = get_node_creator()
     return creator.create_node(node_class, **kwargs)
 
 def create_backdrop(nodes: List['nuke.Node'] = None, **kwargs) -> Optional['nuke.Node']:
     """Helper function to create backdrop"""
-    creator = NodeCreator()
+    creator = get_node_creator()
     return creator.create_backdrop(nodes, **kwargs)
 
 def create_node_group(nodes: List['nuke.Node'] = None, **kwargs) -> Optional['nuke.Group']:
     """Helper function to create group"""
-    creator = NodeCreator()
-    return creator.create_node_group(nodes, **kwargs)
\ No newline at end of file
+    creator = get_node_creator()
+    return creator.create_node_group(nodes, **kwargs)
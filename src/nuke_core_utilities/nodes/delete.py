@@ -2,10 +2,15 @@
 Node deletion utilities
 """
 
-from typing import List, Optional, Dict, Any
+import logging
+import re
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from typing import List, Optional, Dict, Any, Tuple
 import nuke
 
 from ..core.logging_utils import get_logger, TimerContext
+from ..core.undo import undo_group
 from ..graph.connections import ConnectionManager
 from ..data.cache import get_cache
 
@@ -21,7 +26,8 @@ class NodeDeleter:
     def delete_nodes(self, nodes: List['nuke.Node'] = None,
                     cleanup_connections: bool = True,
                     backup: bool = True,
-                    force: bool = False) -> Dict[str, Any]:
+                    force: bool = False,
+                    atomic: bool = True) -> Dict[str, Any]:
         """
         Delete nodes with options
         
@@ -30,6 +36,8 @@ class NodeDeleter:
             cleanup_connections: Reconnect inputs to outputs
             backup: Create backup before deletion
             force: Skip confirmation
+            atomic: Record the whole deletion as one undo step
+                (False for one undo step per node)
             
         Returns:
             Dictionary with deletion results
@@ -47,38 +55,41 @@ class NodeDeleter:
                     if not nuke.ask(f"Delete {len(nodes)} nodes?"):
                         return {'deleted': 0, 'errors': 0, 'message': 'Cancelled by user'}
                 
-                # Create backup if requested
-                if backup:
-                    self._create_deletion_backup(nodes)
-                
-                # Store node info for logging
+                # Store node info for logging (shared with the backup)
                 node_info = []
                 for node in nodes:
                     node_info.append({
                         'name': node.name(),
                         'class': node.Class(),
+                        'position': (node.xpos(), node.ypos()),
                         'inputs': node.inputs(),
                         'dependents': len(node.dependent())
                     })
                 
-                # Handle connections if requested
-                if cleanup_connections:
-                    self._cleanup_connections_before_deletion(nodes)
+                # Create backup if requested
+                if backup:
+                    self._create_deletion_backup(nodes, node_info)
                 
-                # Delete nodes
                 deleted_count = 0
                 error_count = 0
                 
-                for node in nodes[:]:  # Copy list as it might change
-                    try:
-                        nuke.delete(node)
-                        deleted_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to delete node {node.name()}: {e}")
-                        error_count += 1
+                with undo_group("delete_nodes") if atomic else nullcontext():
+                    # Handle connections if requested
+                    if cleanup_connections:
+                        self._cleanup_connections_before_deletion(nodes)
+                    
+                    # Delete nodes
+                    for node in nodes:
+                        try:
+                            nuke.delete(node)
+                            deleted_count += 1
+                        except Exception as e:
+                            if logger.isEnabledFor(logging.ERROR):
+                                logger.error("Failed to delete node %s: %s", node.name(), e)
+                            error_count += 1
                 
-                # Clear cache for deleted nodes
-                self._clear_node_cache(nodes)
+                # Clear cache for deleted nodes (names were read before deletion)
+                self._clear_node_cache([info['name'] for info in node_info])
                 
                 result = {
                     'deleted': deleted_count,
@@ -88,11 +99,11 @@ class NodeDeleter:
                     'success': error_count == 0
                 }
                 
-                logger.info(f"Deleted {deleted_count} nodes ({error_count} errors)")
+                logger.info("Deleted %d nodes (%d errors)", deleted_count, error_count)
                 return result
                 
             except Exception as e:
-                logger.error(f"Failed to delete nodes: {e}")
+                logger.error("Failed to delete nodes: %s", e)
                 return {'deleted': 0, 'errors': 1, 'message': str(e)}
     
     def delete_orphaned_nodes(self, nodes: List['nuke.Node'] = None) -> Dict[str, Any]:
@@ -113,16 +124,16 @@ class NodeDeleter:
             viewer_nodes = nuke.allNodes('Viewer')
             viewer_islands = set()
             
-            # Get all nodes connected to Viewers
+            # Get all nodes connected to Viewers; the shared visited set
+            # stops Viewers on the same island from walking it again. Each
+            # walk reads the live graph, never a cached one.
             for viewer in viewer_nodes:
-                island = self.connection_manager.get_island_nodes(viewer)
-                viewer_islands.update(island)
-            
-            # Find orphaned nodes (not in viewer islands)
-            orphaned = [n for n in nodes if n not in viewer_islands]
+                if viewer not in viewer_islands:
+                    self.connection_manager.get_island_nodes(viewer, viewer_islands)
             
-            # Also remove Viewers themselves from orphaned list
-            orphaned = [n for n in orphaned if n.Class() != 'Viewer']
+            # Find orphaned nodes (not in viewer islands), excluding Viewers
+            orphaned = [n for n in nodes
+                        if n not in viewer_islands and n.Class() != 'Viewer']
             
             if not orphaned:
                 return {'deleted': 0, 'errors': 0, 'message': 'No orphaned nodes found'}
@@ -131,7 +142,7 @@ class NodeDeleter:
             return self.delete_nodes(orphaned, cleanup_connections=False)
             
         except Exception as e:
-            logger.error(f"Failed to delete orphaned nodes: {e}")
+            logger.error("Failed to delete orphaned nodes: %s", e)
             return {'deleted': 0, 'errors': 1, 'message': str(e)}
     
     def delete_by_type(self, node_classes: List[str],
@@ -147,17 +158,23 @@ class NodeDeleter:
             Dictionary with deletion results
         """
         try:
+            exclude_set = frozenset(exclude_nodes) if exclude_nodes else None
+            
+            # Walk the graph once and bucket nodes by class
+            nodes_by_class = defaultdict(list)
+            for node in nuke.allNodes():
+                nodes_by_class[node.Class()].append(node)
+            
             nodes_to_delete = []
             
             for node_class in node_classes:
-                nodes = nuke.allNodes(node_class)
+                nodes = nodes_by_class.get(node_class, [])
                 
-                if exclude_nodes:
-                    nodes = [n for n in nodes if n not in exclude_nodes]
+                if exclude_set:
+                    nodes = [n for n in nodes if n not in exclude_set]
                 
                 nodes_to_delete.extend(nodes)
             
-            
             if not nodes_to_delete:
                 return {'deleted': 0, 'errors': 0, 'message': 'No matching nodes found'}
             
@@ -165,7 +182,7 @@ class NodeDeleter:
             return self.delete_nodes(nodes_to_delete, cleanup_connections=True)
             
         except Exception as e:
-            logger.error(f"Failed to delete by type: {e}")
+            logger.error("Failed to delete by type: %s", e)
             return {'deleted': 0, 'errors': 1, 'message': str(e)}
     
     def delete_by_pattern(self, name_pattern: str,
@@ -183,23 +200,12 @@ class NodeDeleter:
             Dictionary with deletion results
         """
         try:
-            import re
+            # Compile once; plain patterns are escaped to a literal match
+            flags = 0 if case_sensitive else re.IGNORECASE
+            pattern = re.compile(name_pattern if use_regex else re.escape(name_pattern), flags)
+            search = pattern.search
             
-            nodes_to_delete = []
-            
-            for node in nuke.allNodes():
-                node_name = node.name()
-                
-                if not case_sensitive:
-                    node_name = node_name.lower()
-                    name_pattern = name_pattern.lower()
-                
-                if use_regex:
-                    if re.search(name_pattern, node_name):
-                        nodes_to_delete.append(node)
-                else:
-                    if name_pattern in node_name:
-                        nodes_to_delete.append(node)
+            nodes_to_delete = [node for node in nuke.allNodes() if search(node.name())]
             
             if not nodes_to_delete:
                 return {'deleted': 0, 'errors': 0, 'message': 'No matching nodes found'}
@@ -208,7 +214,7 @@ class NodeDeleter:
             return self.delete_nodes(nodes_to_delete, cleanup_connections=True)
             
         except Exception as e:
-            logger.error(f"Failed to delete by pattern: {e}")
+            logger.error("Failed to delete by pattern: %s", e)
             return {'deleted': 0, 'errors': 1, 'message': str(e)}
     
     def delete_duplicate_nodes(self, nodes: List['nuke.Node'] = None) -> Dict[str, Any]:
@@ -225,19 +231,26 @@ class NodeDeleter:
             if nodes is None:
                 nodes = nuke.allNodes()
             
-            # Group nodes by signature
-            node_signatures = {}
+            # Coarse (class, x, y) key per node in a single pass; only nodes
+            # sharing a coarse key can be duplicates
+            coarse_keys = [(node.Class(), node.xpos(), node.ypos()) for node in nodes]
+            coarse_counts = Counter(coarse_keys)
+            
+            # Signatures seen so far; the first node with each one is kept
+            seen_signatures = set()
             duplicates = []
+            signature_details = self._signature_details
             
-            for node in nodes:
-                # Create signature based on class, position, and connections
-                signature = self._get_node_signature(node)
+            for node, coarse_key in zip(nodes, coarse_keys):
+                if coarse_counts[coarse_key] < 2:
+                    continue
                 
-                if signature in node_signatures:
+                signature = (coarse_key, signature_details(node))
+                if signature in seen_signatures:
                     # Found a duplicate
                     duplicates.append(node)
                 else:
-                    node_signatures[signature] = node
+                    seen_signatures.add(signature)
             
             if not duplicates:
                 return {'deleted': 0, 'errors': 0, 'message': 'No duplicate nodes found'}
@@ -246,7 +259,7 @@ class NodeDeleter:
             return self.delete_nodes(duplicates, cleanup_connections=True)
             
         except Exception as e:
-            logger.error(f"Failed to delete duplicate nodes: {e}")
+            logger.error("Failed to delete duplicate nodes: %s", e)
             return {'deleted': 0, 'errors': 1, 'message': str(e)}
     
     def delete_unused_inputs(self, nodes: List['nuke.Node'] = None) -> Dict[str, Any]:
@@ -266,12 +279,20 @@ class NodeDeleter:
             unused_nodes = []
             
             for node in nodes:
-                # Check if node has no inputs and no outputs
-                has_inputs = any(node.input(i) is not None for i in range(node.inputs()))
-                has_outputs = len(node.dependent()) > 0
+                # Check if node has no inputs and no outputs; dependents
+                # are only fetched for nodes without connected inputs
+                input_at = node.input
+                has_inputs = False
+                for i in range(node.inputs()):
+                    if input_at(i) is not None:
+                        has_inputs = True
+                        break
+                if has_inputs:
+                    continue
+                if node.dependent():
+                    continue
                 
-                if not has_inputs and not has_outputs:
-                    unused_nodes.append(node)
+                unused_nodes.append(node)
             
             if not unused_nodes:
                 return {'deleted': 0, 'errors': 0, 'message': 'No unused nodes found'}
@@ -280,121 +301,178 @@ class NodeDeleter:
             return self.delete_nodes(unused_nodes, cleanup_connections=False)
             
         except Exception as e:
-            logger.error(f"Failed to delete unused nodes: {e}")
+            logger.error("Failed to delete unused nodes: %s", e)
             return {'deleted': 0, 'errors': 1, 'message': str(e)}
     
-    def _create_deletion_backup(self, nodes: List['nuke.Node']):
-        """Create backup of nodes before deletion"""
+    def _create_deletion_backup(self, nodes: List['nuke.Node'],
+                                node_info: List[Dict] = None):
+        """
+        Create backup of nodes before deletion
+        
+        Args:
+            nodes: Nodes about to be deleted
+            node_info: Per-node name/class/position already gathered by
+                delete_nodes (None to read them here)
+        """
         try:
             # Store node information in cache
             node_data = []
-            for node in nodes:
+            for i, node in enumerate(nodes):
+                if node_info is not None:
+                    info = node_info[i]
+                    name, node_class, position = info['name'], info['class'], info['position']
+                else:
+                    name, node_class, position = node.name(), node.Class(), (node.xpos(), node.ypos())
+                
                 node_data.append({
-                    'name': node.name(),
-                    'class': node.Class(),
-                    'position': (node.xpos(), node.ypos()),
-                    'knobs': self._extract_knob_values(node)
+                    'name': name,
+                    'class': node_class,
+                    'position': position,
+                    'knobs_tcl': self._serialize_knobs(node)
                 })
             
             # Save to cache
             self.cache.set('deletion_backup', node_data, ttl=3600)  # 1 hour
             
-            logger.debug(f"Created backup for {len(nodes)} nodes")
+            logger.debug("Created backup for %d nodes", len(nodes))
             
         except Exception as e:
-            logger.warning(f"Failed to create deletion backup: {e}")
+            logger.warning("Failed to create deletion backup: %s", e)
+    
+    def _first_input(self, node: 'nuke.Node') -> Optional['nuke.Node']:
+        """First connected input of a node, or None"""
+        input_at = node.input
+        for i in range(node.inputs()):
+            input_node = input_at(i)
+            if input_node:
+                return input_node
+        return None
     
     def _cleanup_connections_before_deletion(self, nodes: List['nuke.Node']):
-        """Reconnect nodes around deleted nodes"""
+        """
+        Reconnect nodes around deleted nodes
+        
+        Each surviving dependent is wired to the nearest surviving node
+        upstream of the deleted node, following first inputs through
+        chains of deleted nodes, so no connection points at a node that
+        is about to be removed.
+        """
         try:
+            delete_set = set(nodes)
+            survivors = {}  # deleted node -> surviving upstream source (or None)
+            
+            def surviving_source(node):
+                path = []
+                current = node
+                while current is not None and current in delete_set:
+                    if current in survivors:
+                        current = survivors[current]
+                        break
+                    if current in path:  # Guard against input cycles
+                        current = None
+                        break
+                    path.append(current)
+                    current = self._first_input(current)
+                for visited in path:
+                    survivors[visited] = current
+                return current
+            
+            # Input slots of each dependent, read once even when several
+            # deleted nodes feed the same dependent
+            dependent_inputs = {}
+            
             # For each node to delete, reconnect its inputs to its outputs
             for node in nodes:
-                inputs = []
-                for i in range(node.inputs()):
-                    input_node = node.input(i)
-                    if input_node:
-                        inputs.append((i, input_node))
+                source_node = surviving_source(node)
+                if source_node is None:
+                    continue
                 
-                outputs = defaultdict(list)
                 for dependent in node.dependent():
-                    for i in range(dependent.inputs()):
-                        if dependent.input(i) == node:
-                            outputs[i].append(dependent)
-                
-                # Reconnect inputs to outputs
-                for output_idx, dependents in outputs.items():
-                    if inputs:  # Has inputs to connect from
-                        source_input_idx, source_node = inputs[0]  # Use first input
-                        for dependent in dependents:
-                            dependent.setInput(output_idx, source_node)
+                    # Dependents that are deleted too are skipped; their own
+                    # dependents are wired past them
+                    if dependent in delete_set:
+                        continue
+                    
+                    slots = dependent_inputs.get(dependent)
+                    if slots is None:
+                        input_at = dependent.input
+                        slots = [input_at(i) for i in range(dependent.inputs())]
+                        dependent_inputs[dependent] = slots
+                    
+                    for i, source in enumerate(slots):
+                        if source == node:
+                            dependent.setInput(i, source_node)
+                            slots[i] = source_node
             
         except Exception as e:
-            logger.warning(f"Failed to cleanup connections: {e}")
+            logger.warning("Failed to cleanup connections: %s", e)
     
-    def _clear_node_cache(self, nodes: List['nuke.Node']):
+    def _clear_node_cache(self, node_names: List[str]):
         """Clear cache entries for deleted nodes"""
         try:
             cache = get_cache()
-            for node in nodes:
-                # Clear any cached data for this node
-                for key in list(cache.cache.keys()):
-                    if f"node:{node.name()}" in key:
-                        cache.delete(key)
+            for name in node_names:
+                cache.delete_node_data(name)
         except Exception as e:
-            logger.warning(f"Failed to clear node cache: {e}")
+            logger.warning("Failed to clear node cache: %s", e)
     
-    def _extract_knob_values(self, node: 'nuke.Node') -> Dict:
-        """Extract knob values from node"""
-        knob_values = {}
-        for knob_name in node.knobs():
-            knob = node.knob(knob_name)
-            if knob:
-                try:
-                    knob_values[knob_name] = knob.value()
-                except:
-                    pass
-        return knob_values
+    def _serialize_knobs(self, node: 'nuke.Node') -> str:
+        """Non-default knob values as a .nk script fragment (see Node.readKnobs)"""
+        try:
+            return node.writeKnobs(nuke.TO_SCRIPT | nuke.WRITE_NON_DEFAULT_ONLY)
+        except Exception as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Failed to serialize knobs of %s: %s", node.name(), e)
+            return ""
     
-    def _get_node_signature(self, node: 'nuke.Node') -> str:
-        """Create unique signature for a node"""
-        signature_parts = [
-            node.Class(),
-            str(node.xpos()),
-            str(node.ypos())
-        ]
-        
-        # Add connection information
-        inputs = []
-        for i in range(node.inputs()):
-            input_node = node.input(i)
-            inputs.append(input_node.name() if input_node else "None")
+    # Knobs whose values distinguish otherwise identical nodes
+    SIGNATURE_KNOBS = ('tile_color', 'disable', 'hide_input')
+    
+    def _signature_details(self, node: 'nuke.Node') -> Tuple[Tuple, Tuple]:
+        """
+        Input and critical knob part of a node signature
         
-        signature_parts.extend(inputs)
+        Inputs are the Node objects themselves (Node equality is stable),
+        which saves a name() call per input slot.
+        """
+        input_at = node.input
+        inputs = tuple(input_at(i) for i in range(node.inputs()))
         
         # Add knob values for critical knobs
-        critical_knobs = ['tile_color', 'disable', 'hide_input']
-        for knob_name in critical_knobs:
-            knob = node.knob(knob_name)
-            if knob:
+        knobs = node.knobs()
+        knob_values = []
+        for knob_name in self.SIGNATURE_KNOBS:
+            knob = knobs.get(knob_name)
+            if knob is not None:
                 try:
-                    signature_parts.append(f"{knob_name}:{knob.value()}")
-                except:
+                    knob_values.append((knob_name, knob.value()))
+                except Exception:
                     pass
         
-        return "|".join(signature_parts)
+        return inputs, tuple(knob_values)
+
+# Global node deleter instance
+_node_deleter = None
+
+def get_node_deleter() -> NodeDeleter:
+    """Get global node deleter"""
+    global _node_deleter
+    if _node_deleter is None:
+        _node_deleter = NodeDeleter()
+    return _node_deleter
 
 # Helper functions
 def delete_nodes(nodes: List['nuke.Node'] = None, **kwargs) -> Dict[str, Any]:
     """Helper function to delete nodes"""
-    deleter = NodeDeleter()
+    deleter = get_node_deleter()
     return deleter.delete_nodes(nodes, **kwargs)
 
 def delete_orphaned_nodes(nodes: List['nuke.Node'] = None) -> Dict[str, Any]:
     """Helper function to delete orphaned nodes"""
-    deleter = NodeDeleter()
+    deleter = get_node_deleter()
     return deleter.delete_orphaned_nodes(nodes)
 
 def delete_by_type(node_classes: List[str], **kwargs) -> Dict[str, Any]:
     """Helper function to delete nodes by type"""
-    deleter = NodeDeleter()
+    deleter = get_node_deleter()
     return deleter.delete_by_type(node_classes, **kwargs)
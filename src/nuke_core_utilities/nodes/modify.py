@@ -3,15 +3,68 @@ Node modification and transformation utilities
 """
 
 import math
+from collections import defaultdict
 from typing import Dict, List, Tuple, Optional, Any, Union
 import nuke
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from ..core.logging_utils import get_logger, TimerContext
 from ..core.constants import *
+from ..core.undo import undo_group
 from ..data.cache import cached_function
 
 logger = get_logger(__name__)
 
+# Node count above which scale/rotate/mirror transform positions with NumPy
+NUMPY_TRANSFORM_THRESHOLD = 256
+
+def _collect_xy(nodes: List['nuke.Node']):
+    """Node positions as an (N, 2) float array"""
+    xy = np.empty((len(nodes), 2))
+    for i, n in enumerate(nodes):
+        xy[i] = n.xpos(), n.ypos()
+    return xy
+
+def _transform_positions(nodes: List['nuke.Node'],
+                         matrix: Tuple[Tuple[float, float], Tuple[float, float]],
+                         origin: Optional[Tuple[int, int]] = None):
+    """
+    Apply a 2x2 linear map to node positions about an origin
+    
+    Offsets from the origin are truncated toward zero after the map.
+    
+    Args:
+        nodes: Nodes to move
+        matrix: Row-major ((a, b), (c, d)) applied to (dx, dy)
+        origin: Fixed point of the map (None for integer centroid)
+    """
+    if np is not None and len(nodes) > NUMPY_TRANSFORM_THRESHOLD:
+        xy = _collect_xy(nodes)
+        if origin is None:
+            origin = xy.sum(axis=0) // len(nodes)
+        origin = np.asarray(origin, dtype=np.float64)
+        new_xy = origin + np.trunc((xy - origin) @ np.asarray(matrix).T)
+        for node, (x, y) in zip(nodes, new_xy.astype(np.int64).tolist()):
+            node.setXYpos(x, y)
+        return
+    
+    positions = [(n.xpos(), n.ypos()) for n in nodes]
+    if origin is None:
+        origin = (sum(x for x, _ in positions) // len(positions),
+                  sum(y for _, y in positions) // len(positions))
+    
+    origin_x, origin_y = origin
+    (a, b), (c, d) = matrix
+    for node, (x, y) in zip(nodes, positions):
+        vec_x = x - origin_x
+        vec_y = y - origin_y
+        node.setXYpos(origin_x + int(a * vec_x + b * vec_y),
+                      origin_y + int(c * vec_x + d * vec_y))
+
 class NodeModifier:
     """Node modification and transformation utilities"""
     
@@ -65,21 +118,22 @@ class NodeModifier:
             Dictionary mapping node classes to color counts
         """
         try:
-            if nodes is None:
-                nodes = nuke.allNodes()
-            
-            color_counts = defaultdict(int)
-            
-            for node in nodes:
-                node_class = node.Class()
-                color = self._get_color_for_node_class(node_class)
+            with undo_group("color_nodes_by_type"):
+                if nodes is None:
+                    nodes = nuke.allNodes()
+                
+                color_counts = defaultdict(int)
+                
+                for node in nodes:
+                    node_class = node.Class()
+                    color = self._get_color_for_node_class(node_class)
+                    
+                    if self.set_node_color(node, color):
+                        color_counts[node_class] += 1
+                
+                logger.info(f"Colored {len(nodes)} nodes by type")
+                return dict(color_counts)
                 
-                if self.set_node_color(node, color):
-                    color_counts[node_class] += 1
-            
-            logger.info(f"Colored {len(nodes)} nodes by type")
-            return dict(color_counts)
-            
         except Exception as e:
             logger.error(f"Failed to color nodes by type: {e}")
             return {}
@@ -110,19 +164,25 @@ class NodeModifier:
             rename_map = {}
             index = start_index
             
+            # Names in use, updated as nodes are renamed (dry runs included,
+            # so the preview matches a real run)
+            existing = {n.name() for n in nuke.allNodes()}
+            
             for node in nodes:
                 old_name = node.name()
                 node_class = node.Class().lower()
                 
-                # Generate new name
+                # Generate new name ('class' is a keyword, so pass it unpacked)
                 new_name = pattern.format(
-                    node_class,
                     index=index,
-                    old_name=old_name
+                    old_name=old_name,
+                    **{'class': node_class}
                 )
                 
                 # Ensure unique name
-                new_name = self._ensure_unique_name(new_name, node)
+                new_name = self._ensure_unique_name(new_name, existing, old_name)
+                existing.discard(old_name)
+                existing.add(new_name)
                 
                 if not dry_run:
                     node.setName(new_name)
@@ -156,57 +216,58 @@ class NodeModifier:
             Success status
         """
         try:
-            if nodes is None:
-                nodes = nuke.selectedNodes()
-            
-            if len(nodes) < 2:
-                return False
-            
-            if alignment in ['left', 'right', 'horizontal']:
-                # Sort by y position
-                nodes.sort(key=lambda n: n.ypos())
-                
-                # Align
-                if alignment == 'left':
-                    x_pos = min(n.xpos() for n in nodes)
-                    for node in nodes:
-                        node.setXpos(x_pos)
-                elif alignment == 'right':
-                    x_pos = max(n.xpos() + n.screenWidth() for n in nodes)
-                    for node in nodes:
-                        node.setXpos(x_pos - node.screenWidth())
-                else:  # horizontal with spacing
-                    # Sort by x position
-                    nodes.sort(key=lambda n: n.xpos())
-                    x_pos = nodes[0].xpos()
-                    for node in nodes:
-                        node.setXpos(x_pos)
-                        x_pos += node.screenWidth() + spacing
-            
-            elif alignment in ['top', 'bottom', 'vertical']:
-                # Sort by x position
-                nodes.sort(key=lambda n: n.xpos())
-                
-                # Align
-                if alignment == 'top':
-                    y_pos = min(n.ypos() for n in nodes)
-                    for node in nodes:
-                        node.setYpos(y_pos)
-                elif alignment == 'bottom':
-                    y_pos = max(n.ypos() + n.screenHeight() for n in nodes)
-                    for node in nodes:
-                        node.setYpos(y_pos - node.screenHeight())
-                else:  # vertical with spacing
+            with undo_group("align_nodes"):
+                if nodes is None:
+                    nodes = nuke.selectedNodes()
+                
+                if len(nodes) < 2:
+                    return False
+                
+                if alignment in ['left', 'right', 'horizontal']:
                     # Sort by y position
                     nodes.sort(key=lambda n: n.ypos())
-                    y_pos = nodes[0].ypos()
-                    for node in nodes:
-                        node.setYpos(y_pos)
-                        y_pos += node.screenHeight() + spacing
-            
-            logger.debug(f"Aligned {len(nodes)} nodes {alignment}")
-            return True
-            
+                    
+                    # Align
+                    if alignment == 'left':
+                        x_pos = min(n.xpos() for n in nodes)
+                        for node in nodes:
+                            node.setXpos(x_pos)
+                    elif alignment == 'right':
+                        x_pos = max(n.xpos() + n.screenWidth() for n in nodes)
+                        for node in nodes:
+                            node.setXpos(x_pos - node.screenWidth())
+                    else:  # horizontal with spacing
+                        # Sort by x position
+                        nodes.sort(key=lambda n: n.xpos())
+                        x_pos = nodes[0].xpos()
+                        for node in nodes:
+                            node.setXpos(x_pos)
+                            x_pos += node.screenWidth() + spacing
+                
+                elif alignment in ['top', 'bottom', 'vertical']:
+                    # Sort by x position
+                    nodes.sort(key=lambda n: n.xpos())
+                    
+                    # Align
+                    if alignment == 'top':
+                        y_pos = min(n.ypos() for n in nodes)
+                        for node in nodes:
+                            node.setYpos(y_pos)
+                    elif alignment == 'bottom':
+                        y_pos = max(n.ypos() + n.screenHeight() for n in nodes)
+                        for node in nodes:
+                            node.setYpos(y_pos - node.screenHeight())
+                    else:  # vertical with spacing
+                        # Sort by y position
+                        nodes.sort(key=lambda n: n.ypos())
+                        y_pos = nodes[0].ypos()
+                        for node in nodes:
+                            node.setYpos(y_pos)
+                            y_pos += node.screenHeight() + spacing
+                
+                logger.debug(f"Aligned {len(nodes)} nodes {alignment}")
+                return True
+                
         except Exception as e:
             logger.error(f"Failed to align nodes: {e}")
             return False
@@ -226,55 +287,56 @@ class NodeModifier:
             Success status
         """
         try:
-            if nodes is None:
-                nodes = nuke.selectedNodes()
-            
-            if len(nodes) < 2:
-                return False
-            
-            if direction == 'horizontal':
-                # Sort by x position
-                nodes.sort(key=lambda n: n.xpos())
-                
-                # Get bounds
-                min_x = min(n.xpos() for n in nodes)
-                max_x = max(n.xpos() for n in nodes)
-                
-                # Calculate positions
-                total_width = max_x - min_x
-                if len(nodes) > 1:
-                    step = total_width / (len(nodes) - 1)
-                else:
-                    step = 0
-                
-                # Distribute
-                for i, node in enumerate(nodes):
-                    target_x = min_x + i * step
-                    node.setXpos(int(target_x))
-            
-            else:  # vertical
-                # Sort by y position
-                nodes.sort(key=lambda n: n.ypos())
-                
-                # Get bounds
-                min_y = min(n.ypos() for n in nodes)
-                max_y = max(n.ypos() for n in nodes)
-                
-                # Calculate positions
-                total_height = max_y - min_y
-                if len(nodes) > 1:
-                    step = total_height / (len(nodes) - 1)
-                else:
-                    step = 0
-                
-                # Distribute
-                for i, node in enumerate(nodes):
-                    target_y = min_y + i * step
-                    node.setYpos(int(target_y))
-            
-            logger.debug(f"Distributed {len(nodes)} nodes {direction}")
-            return True
-            
+            with undo_group("distribute_nodes"):
+                if nodes is None:
+                    nodes = nuke.selectedNodes()
+                
+                if len(nodes) < 2:
+                    return False
+                
+                if direction == 'horizontal':
+                    # Sort by x position
+                    nodes.sort(key=lambda n: n.xpos())
+                    
+                    # Get bounds
+                    min_x = min(n.xpos() for n in nodes)
+                    max_x = max(n.xpos() for n in nodes)
+                    
+                    # Calculate positions
+                    total_width = max_x - min_x
+                    if len(nodes) > 1:
+                        step = total_width / (len(nodes) - 1)
+                    else:
+                        step = 0
+                    
+                    # Distribute
+                    for i, node in enumerate(nodes):
+                        target_x = min_x + i * step
+                        node.setXpos(int(target_x))
+                
+                else:  # vertical
+                    # Sort by y position
+                    nodes.sort(key=lambda n: n.ypos())
+                    
+                    # Get bounds
+                    min_y = min(n.ypos() for n in nodes)
+                    max_y = max(n.ypos() for n in nodes)
+                    
+                    # Calculate positions
+                    total_height = max_y - min_y
+                    if len(nodes) > 1:
+                        step = total_height / (len(nodes) - 1)
+                    else:
+                        step = 0
+                    
+                    # Distribute
+                    for i, node in enumerate(nodes):
+                        target_y = min_y + i * step
+                        node.setYpos(int(target_y))
+                
+                logger.debug(f"Distributed {len(nodes)} nodes {direction}")
+                return True
+                
         except Exception as e:
             logger.error(f"Failed to distribute nodes: {e}")
             return False
@@ -294,46 +356,19 @@ class NodeModifier:
             Success status
         """
         try:
-            if nodes is None:
-                nodes = nuke.selectedNodes()
-            
-            if not nodes:
-                return False
-            
-            # Calculate origin if not provided
-            if origin is None:
-                x_positions = [n.xpos() for n in nodes]
-                y_positions = [n.ypos() for n in nodes]
-                origin = (
-                    sum(x_positions) // len(x_positions),
-                    sum(y_positions) // len(y_positions)
-                )
-            
-            origin_x, origin_y = origin
-            
-            # Scale positions
-            for node in nodes:
-                current_x = node.xpos()
-                current_y = node.ypos()
+            with undo_group("scale_nodes"):
+                if nodes is None:
+                    nodes = nuke.selectedNodes()
                 
-                # Calculate vector from origin
-                vec_x = current_x - origin_x
-                vec_y = current_y - origin_y
+                if not nodes:
+                    return False
                 
-                # Scale vector
-                vec_x *= scale_factor
-                vec_y *= scale_factor
+                _transform_positions(
+                    nodes, ((scale_factor, 0.0), (0.0, scale_factor)), origin)
                 
-                # Calculate new position
-                new_x = origin_x + int(vec_x)
-                new_y = origin_y + int(vec_y)
+                logger.debug(f"Scaled {len(nodes)} nodes by factor {scale_factor}")
+                return True
                 
-                node.setXpos(new_x)
-                node.setYpos(new_y)
-            
-            logger.debug(f"Scaled {len(nodes)} nodes by factor {scale_factor}")
-            return True
-            
         except Exception as e:
             logger.error(f"Failed to scale nodes: {e}")
             return False
@@ -353,51 +388,23 @@ class NodeModifier:
             Success status
         """
         try:
-            if nodes is None:
-                nodes = nuke.selectedNodes()
-            
-            if not nodes:
-                return False
-            
-            # Convert angle to radians
-            angle_rad = math.radians(angle_degrees)
-            cos_a = math.cos(angle_rad)
-            sin_a = math.sin(angle_rad)
-            
-            # Calculate origin if not provided
-            if origin is None:
-                x_positions = [n.xpos() for n in nodes]
-                y_positions = [n.ypos() for n in nodes]
-                origin = (
-                    sum(x_positions) // len(x_positions),
-                    sum(y_positions) // len(y_positions)
-                )
-            
-            origin_x, origin_y = origin
-            
-            # Rotate positions
-            for node in nodes:
-                current_x = node.xpos()
-                current_y = node.ypos()
+            with undo_group("rotate_nodes"):
+                if nodes is None:
+                    nodes = nuke.selectedNodes()
                 
-                # Calculate vector from origin
-                vec_x = current_x - origin_x
-                vec_y = current_y - origin_y
+                if not nodes:
+                    return False
                 
-                # Rotate vector
-                new_x = vec_x * cos_a - vec_y * sin_a
-                new_y = vec_x * sin_a + vec_y * cos_a
+                # Convert angle to radians
+                angle_rad = math.radians(angle_degrees)
+                cos_a = math.cos(angle_rad)
+                sin_a = math.sin(angle_rad)
                 
-                # Calculate new position
-                new_x = origin_x + int(new_x)
-                new_y = origin_y + int(new_y)
+                _transform_positions(nodes, ((cos_a, -sin_a), (sin_a, cos_a)), origin)
+                
+                logger.debug(f"Rotated {len(nodes)} nodes by {angle_degrees} degrees")
+                return True
                 
-                node.setXpos(new_x)
-                node.setYpos(new_y)
-            
-            logger.debug(f"Rotated {len(nodes)} nodes by {angle_degrees} degrees")
-            return True
-            
         except Exception as e:
             logger.error(f"Failed to rotate nodes: {e}")
             return False
@@ -417,43 +424,21 @@ class NodeModifier:
             Success status
         """
         try:
-            if nodes is None:
-                nodes = nuke.selectedNodes()
-            
-            if not nodes:
-                return False
-            
-            # Calculate origin if not provided
-            if origin is None:
-                x_positions = [n.xpos() for n in nodes]
-                y_positions = [n.ypos() for n in nodes]
-                origin = (
-                    sum(x_positions) // len(x_positions),
-                    sum(y_positions) // len(y_positions)
-                )
-            
-            origin_x, origin_y = origin
-            
-            # Mirror positions
-            for node in nodes:
-                current_x = node.xpos()
-                current_y = node.ypos()
-                
-                if axis in ['vertical', 'both']:
-                    # Mirror vertically (across x-axis)
-                    distance_x = current_x - origin_x
-                    new_x = origin_x - distance_x
-                    node.setXpos(new_x)
-                
-                if axis in ['horizontal', 'both']:
-                    # Mirror horizontally (across y-axis)
-                    distance_y = current_y - origin_y
-                    new_y = origin_y - distance_y
-                    node.setYpos(new_y)
-            
-            logger.debug(f"Mirrored {len(nodes)} nodes across {axis} axis")
-            return True
-            
+            with undo_group("mirror_nodes"):
+                if nodes is None:
+                    nodes = nuke.selectedNodes()
+                
+                if not nodes:
+                    return False
+                
+                # Vertical flips x about the origin, horizontal flips y
+                flip_x = -1 if axis in ('vertical', 'both') else 1
+                flip_y = -1 if axis in ('horizontal', 'both') else 1
+                _transform_positions(nodes, ((flip_x, 0), (0, flip_y)), origin)
+                
+                logger.debug(f"Mirrored {len(nodes)} nodes across {axis} axis")
+                return True
+                
         except Exception as e:
             logger.error(f"Failed to mirror nodes: {e}")
             return False
@@ -481,22 +466,23 @@ class NodeModifier:
             Dictionary mapping node names to new disabled state
         """
         try:
-            if nodes is None:
-                nodes = nuke.selectedNodes()
-            
-            results = {}
-            
-            for node in nodes:
-                disable_knob = node.knob('disable')
-                if disable_knob:
-                    current = disable_knob.value()
-                    new_state = not current
-                    disable_knob.setValue(new_state)
-                    results[node.name()] = new_state
-            
-            logger.debug(f"Toggled disabled state for {len(results)} nodes")
-            return results
-            
+            with undo_group("toggle_nodes_disabled"):
+                if nodes is None:
+                    nodes = nuke.selectedNodes()
+                
+                results = {}
+                
+                for node in nodes:
+                    disable_knob = node.knob('disable')
+                    if disable_knob:
+                        current = disable_knob.value()
+                        new_state = not current
+                        disable_knob.setValue(new_state)
+                        results[node.name()] = new_state
+                
+                logger.debug(f"Toggled disabled state for {len(results)} nodes")
+                return results
+                
         except Exception as e:
             logger.error(f"Failed to toggle nodes disabled: {e}")
             return {}
@@ -525,20 +511,27 @@ class NodeModifier:
         else:
             return COLOR_UTILITY
     
-    def _ensure_unique_name(self, name: str, node: 'nuke.Node') -> str:
-        """Ensure node name is unique"""
+    def _ensure_unique_name(self, name: str, existing: set, own_name: str) -> str:
+        """
+        Ensure node name is unique
+        
+        Args:
+            name: Requested name
+            existing: Names currently in use
+            own_name: Current name of the node being renamed
+            
+        Returns:
+            name, or name with the first free numeric suffix
+        """
         original_name = name
         counter = 1
         
-        while True:
-            # Check if name exists (excluding the node itself)
-            existing = nuke.toNode(name)
-            if not existing or existing == node:
-                return name
-            
-            # Try with incrementing counter
+        # The node's own name counts as free
+        while name != own_name and name in existing:
             name = f"{original_name}_{counter}"
             counter += 1
+        
+        return name
 
 # Helper functions
 def set_node_color(node: 'nuke.Node', color: Union[int, str]) -> bool:
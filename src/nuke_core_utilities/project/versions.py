@@ -421,14 +421,15 @@ class VersionManager:
     def _get_script_info(self) -> Dict[str, Any]:
         """Get script information for snapshot"""
         try:
+            knobs = nuke.root().knobs()
             return {
                 'node_count': len(nuke.allNodes()),
                 'frame_range': (
-                    nuke.root()['first_frame'].value(),
-                    nuke.root()['last_frame'].value()
+                    knobs['first_frame'].value(),
+                    knobs['last_frame'].value()
                 ),
-                'fps': nuke.root()['fps'].value(),
-                'format': str(nuke.root()['format'].value())
+                'fps': knobs['fps'].value(),
+                'format': str(knobs['format'].value())
             }
         except:
             return {}
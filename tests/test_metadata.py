@@ -0,0 +1,49 @@
+"""
+Tests for script metadata serialization
+
+These need Nuke's Python module and are skipped elsewhere; run them with
+Nuke's interpreter, e.g. ``nuke -t -m pytest tests``.
+"""
+
+import io
+import json
+
+import pytest
+
+nuke = pytest.importorskip("nuke")
+
+from nuke_core_utilities.data.metadata import MetadataManager, NODE_FIELDS
+
+
+@pytest.fixture
+def script_nodes():
+    nodes = [nuke.nodes.Blur(name="MetaBlur"), nuke.nodes.Grade(name="Meta{Grade}")]
+    nodes[1].setInput(0, nodes[0])
+    yield nodes
+    for node in nodes:
+        nuke.delete(node)
+
+
+def test_stream_script_metadata_is_valid_json(script_nodes):
+    manager = MetadataManager()
+    buffer = io.BytesIO()
+    
+    count = manager.stream_script_metadata(buffer)
+    data = json.loads(buffer.getvalue())
+    
+    assert count == len(nuke.allNodes())
+    assert set(data) == {'script_info', 'nodes', 'statistics', 'versions', 'user_data'}
+    assert tuple(data['nodes']) == NODE_FIELDS
+    assert all(len(column) == count for column in data['nodes'].values())
+    assert {"MetaBlur", "Meta{Grade}"} <= set(data['nodes']['names'])
+
+
+def test_stream_matches_extract_schema(script_nodes):
+    manager = MetadataManager()
+    buffer = io.BytesIO()
+    
+    manager.stream_script_metadata(buffer)
+    streamed = json.loads(buffer.getvalue())
+    extracted = json.loads(json.dumps(manager.extract_script_metadata(), default=str))
+    
+    assert streamed == extracted